@@ -0,0 +1,83 @@
+"""
+adjacency.py
+
+Compiled land-border graph in compressed-sparse-row (CSR) form.
+
+LAND_CONNECTIONS is a readable dict of name -> [neighbour names]. The simulation
+compiles it once into integer arrays so spread code works on indices only:
+
+    neighbours of region k = indices[offsets[k]:offsets[k + 1]]
+
+Neighbour order is preserved from the source lists, so a given random pick
+always lands on the same neighbour as the name-based lookup.
+"""
+
+import numpy as np
+
+
+class LandGraph:
+    """Integer-indexed, symmetric land adjacency over a fixed list of regions."""
+
+    def __init__(self, region_names: list[str], offsets, indices):
+        self.region_names = list(region_names)
+        self.index = {name: idx for idx, name in enumerate(self.region_names)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.degree = np.diff(self.offsets)
+
+    @classmethod
+    def from_connections(cls, region_names: list[str], connections: dict[str, list[str]]):
+        """
+        Compile a name-keyed adjacency dict into CSR arrays.
+
+        Raises ValueError if a connection names an unknown region or if a border is
+        only listed in one direction (LAND_CONNECTIONS is symmetric by design).
+        """
+        index = {name: idx for idx, name in enumerate(region_names)}
+
+        unknown = sorted(
+            {src for src in connections if src not in index}
+            | {dst for nbrs in connections.values() for dst in nbrs if dst not in index}
+        )
+        if unknown:
+            raise ValueError(f"Land connections reference unknown regions: {', '.join(unknown)}")
+
+        offsets = [0]
+        indices = []
+        for name in region_names:
+            indices.extend(index[dst] for dst in connections.get(name, []))
+            offsets.append(len(indices))
+
+        graph = cls(region_names, offsets, indices)
+
+        missing = graph.asymmetric_pairs()
+        if missing:
+            pairs = ", ".join(f"{a} -> {b}" for a, b in missing)
+            raise ValueError(f"Land connections are not symmetric (no reverse border for: {pairs})")
+
+        return graph
+
+    def __len__(self):
+        return len(self.region_names)
+
+    def neighbours(self, idx: int):
+        """Neighbour indices of region idx (a view into the CSR array)."""
+        return self.indices[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def neighbour_names(self, name: str) -> list[str]:
+        idx = self.index.get(name)
+        if idx is None:
+            return []
+        return [self.region_names[dst] for dst in self.neighbours(idx).tolist()]
+
+    def asymmetric_pairs(self) -> list[tuple[str, str]]:
+        """Every (src, dst) edge whose reverse edge (dst, src) is missing."""
+        src = np.repeat(np.arange(len(self.region_names), dtype=np.int64), self.degree)
+        n = len(self.region_names)
+        forward = src * n + self.indices
+        backward = self.indices * n + src
+        missing = ~np.isin(forward, backward)
+        return [
+            (self.region_names[a], self.region_names[b])
+            for a, b in zip(src[missing].tolist(), self.indices[missing].tolist())
+        ]
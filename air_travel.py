@@ -0,0 +1,110 @@
+"""
+air_travel.py
+
+Air-travel spread driven by a sparse origin -> destination passenger-flow matrix.
+
+Route data lives in air_routes.csv (next to region_data.py):
+
+    origin,destination,daily_passengers
+
+Only routes that exist are stored (COO triplets, sorted by origin), so one day of
+air spread is a single sparse matrix-vector product over the routes instead of a
+loop over every pair of regions.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+AIR_ROUTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "air_routes.csv")
+
+
+def load_air_routes(path: str = AIR_ROUTES_PATH) -> list[tuple[str, str, float]]:
+    """Read (origin, destination, daily_passengers) rows from a routes CSV."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing air routes file: {path}")
+
+    routes = []
+    with open(path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            routes.append((row["origin"], row["destination"], float(row["daily_passengers"])))
+    return routes
+
+
+class AirNetwork:
+    """Passenger flows between regions, stored as sparse triplets over region indices."""
+
+    def __init__(self, region_names: list[str], routes: list[tuple[str, str, float]]):
+        self.region_names = list(region_names)
+        index = {name: idx for idx, name in enumerate(self.region_names)}
+
+        unknown = sorted({name for o, d, _p in routes for name in (o, d) if name not in index})
+        if unknown:
+            raise ValueError(f"Air routes reference unknown regions: {', '.join(unknown)}")
+
+        # Domestic "routes" would just re-seed a region from itself, so they are dropped.
+        triplets = sorted(
+            (index[o], index[d], float(p)) for o, d, p in routes if o != d and p > 0.0
+        )
+        self.origins = np.array([t[0] for t in triplets], dtype=np.int64)
+        self.destinations = np.array([t[1] for t in triplets], dtype=np.int64)
+        self.flow = np.array([t[2] for t in triplets], dtype=np.float64)
+
+    @classmethod
+    def from_arrays(cls, region_names: list[str], origins, destinations, flow):
+        """
+        Build from parallel index arrays (e.g. a compiled world file) without a
+        per-route Python pass. Same filtering and ordering as the list constructor.
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        flow = np.asarray(flow, dtype=np.float64)
+
+        n = len(region_names)
+        if origins.size and (min(origins.min(), destinations.min()) < 0 or max(origins.max(), destinations.max()) >= n):
+            raise ValueError("Air routes reference region indices outside the world")
+
+        keep = (origins != destinations) & (flow > 0.0)
+        origins, destinations, flow = origins[keep], destinations[keep], flow[keep]
+        order = np.lexsort((flow, destinations, origins))
+
+        network = cls(region_names, [])
+        network.origins = origins[order]
+        network.destinations = destinations[order]
+        network.flow = flow[order]
+        return network
+
+    def __len__(self):
+        return len(self.flow)
+
+    def arrivals(self, prevalence, airports_open):
+        """
+        Expected infectious arrivals per destination for one day.
+
+        prevalence: share of each region's population that is carrying the disease.
+        airports_open: bool per region; a closed airport removes that region's
+        outgoing (row) and incoming (column) flows.
+        """
+        open_mask = np.asarray(airports_open, dtype=np.float64)
+        outbound = np.asarray(prevalence, dtype=np.float64) * open_mask
+
+        # Sparse mat-vec: arrivals[d] = sum over routes o->d of flow * outbound[o].
+        weights = self.flow * outbound[self.origins]
+        arrivals = np.bincount(self.destinations, weights=weights, minlength=len(self.region_names))
+        return arrivals * open_mask
+
+    def seeds(self, rng, active, populations, airports_open, seed_scale: float, seed_cap: float):
+        """
+        Draw how many new Exposed each region receives by air today.
+
+        Arrivals are random (Poisson around the expected count) and whole people, so
+        clean regions are not trickled fractional exposure every day.
+        """
+        populations = np.asarray(populations, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prevalence = np.where(populations > 0, np.asarray(active) / populations, 0.0)
+
+        expected = self.arrivals(prevalence, airports_open) * seed_scale
+        seeds = rng.poisson(expected).astype(np.float64)
+        return np.minimum(seeds, seed_cap)
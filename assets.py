@@ -0,0 +1,185 @@
+"""
+assets.py
+
+Image loading shared by the menus and the map renderer.
+
+AssetManager turns (path, target size) into a ready-to-blit surface:
+
+- PNGs are decoded and scaled in a thread pool (load_many), which overlaps the
+  ~20 map images at startup instead of decoding them one after another.
+- Finished surfaces are cached for the life of the process, so re-entering a
+  menu does not decode and rescale its background again.
+- With cache_dir set, images that needed rescaling are also written to disk as
+  raw RGBA, keyed by the source file's path, mtime and size and by the target
+  size. A later launch reads those bytes straight back instead of decoding and
+  rescaling again. Images already at their target size are not duplicated.
+
+Display conversion (convert / convert_alpha) needs the display, so it always
+runs on the calling (main) thread after the workers finish.
+
+Surfaces are shared between callers: blit from them or copy them, never draw on them.
+"""
+
+import hashlib
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Disk cache entry: magic, version, width, height, then width * height * 4 RGBA bytes.
+_CACHE_MAGIC = b"PPAS"
+_CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sIII")
+
+
+class AssetManager:
+    """Threaded, cached image loader (see module docstring)."""
+
+    def __init__(self, cache_dir: str | None = None, max_workers: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+        # (abs path, size, alpha, smooth) -> converted surface
+        self._surfaces: dict[tuple, pygame.Surface] = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.decodes = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(
+        self,
+        path: str,
+        size: tuple[int, int] | None = None,
+        alpha: bool = True,
+        smooth: bool = True,
+    ) -> pygame.Surface:
+        """
+        Load one image, scaled to `size` if it differs (None keeps the file's size).
+
+        alpha=False uses convert() (opaque, fastest to blit); smooth=False scales with
+        nearest-neighbour, which ID maps need so colours never blend.
+        """
+        return self.load_many([path], size=size, alpha=alpha, smooth=smooth)[0]
+
+    def load_many(
+        self,
+        paths: list[str],
+        size: tuple[int, int] | None = None,
+        alpha: bool = True,
+        smooth: bool = True,
+    ) -> list[pygame.Surface]:
+        """Load several images with the same options, decoding uncached ones in parallel."""
+        keys = [self._key(path, size, alpha, smooth) for path in paths]
+
+        pending = []
+        for key in keys:
+            if key in self._surfaces:
+                self.hits += 1
+            elif key not in pending:
+                pending.append(key)
+
+        for key in pending:
+            if not os.path.exists(key[0]):
+                raise FileNotFoundError(f"Missing image asset: {key[0]}")
+
+        if len(pending) == 1:
+            decoded = [self._decode(pending[0])]
+        elif pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                decoded = list(pool.map(self._decode, pending))
+        else:
+            decoded = []
+
+        for key, (surface, from_disk) in zip(pending, decoded):
+            if from_disk:
+                self.disk_hits += 1
+            else:
+                self.decodes += 1
+            self._surfaces[key] = surface.convert_alpha() if key[2] else surface.convert()
+
+        return [self._surfaces[key] for key in keys]
+
+    def clear(self):
+        """Drop the in-process cache (the disk cache is left alone)."""
+        self._surfaces.clear()
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._surfaces),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "decodes": self.decodes,
+        }
+
+    @staticmethod
+    def _key(path: str, size, alpha: bool, smooth: bool) -> tuple:
+        return (os.path.abspath(path), tuple(size) if size else None, bool(alpha), bool(smooth))
+
+    def _decode(self, key: tuple) -> tuple[pygame.Surface, bool]:
+        # Runs on a worker thread: no display calls (and no shared counters) here.
+        # Returns (unconverted surface, came from the disk cache).
+        path, size, _alpha, smooth = key
+
+        cache_path = self._cache_path(key)
+        if cache_path:
+            surface = self._read_cache(cache_path)
+            if surface is not None:
+                return surface, True
+
+        image = pygame.image.load(path)
+        if not size or image.get_size() == size:
+            return image, False
+
+        if smooth:
+            # smoothscale only accepts 24/32-bit input; palette PNGs are widened first.
+            image = pygame.image.frombytes(pygame.image.tobytes(image, "RGBA"), image.get_size(), "RGBA")
+            image = pygame.transform.smoothscale(image, size)
+        else:
+            image = pygame.transform.scale(image, size)
+
+        if cache_path:
+            self._write_cache(cache_path, image)
+        return image, False
+
+    def _cache_path(self, key: tuple) -> str | None:
+        if not self.cache_dir:
+            return None
+
+        path, size, _alpha, smooth = key
+        stat = os.stat(path)
+        ident = f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{smooth}"
+        digest = hashlib.sha1(ident.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.rgba")
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> pygame.Surface | None:
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if len(data) < _CACHE_HEADER.size:
+            return None
+        magic, version, width, height = _CACHE_HEADER.unpack_from(data)
+        pixels = data[_CACHE_HEADER.size:]
+        if magic != _CACHE_MAGIC or version != _CACHE_VERSION or len(pixels) != width * height * 4:
+            # Stale or truncated entry: fall back to decoding the PNG (it gets rewritten).
+            return None
+        return pygame.image.frombytes(pixels, (width, height), "RGBA")
+
+    @staticmethod
+    def _write_cache(cache_path: str, image: pygame.Surface):
+        width, height = image.get_size()
+        header = _CACHE_HEADER.pack(_CACHE_MAGIC, _CACHE_VERSION, width, height)
+
+        # Write-then-rename so a crash never leaves a half-written entry behind.
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(pygame.image.tobytes(image, "RGBA"))
+        os.replace(tmp_path, cache_path)
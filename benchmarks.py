@@ -0,0 +1,322 @@
+"""
+benchmarks.py
+
+Reproducible micro-benchmarks for the simulation and rendering hot paths.
+
+Usage:
+    python benchmarks.py                                  # run everything, print a table
+    python benchmarks.py --json baseline.json             # also save the results
+    python benchmarks.py --compare baseline.json          # flag regressions against a baseline
+    python benchmarks.py --filter sim/vector --repeats 10
+
+Benchmarks:
+    sim/<engine>/<n>/tick       Simulation.update_one_day with per-tick rates (game smoothing)
+    sim/<engine>/<n>/day        Simulation.update_one_day with per-day rates
+    sim/vector/<n>/land_exports VectorEngine.land_exports for one day (the export step alone)
+    render/draw/cold            MapRenderer.draw with an empty tint cache
+    render/draw/warm            MapRenderer.draw with every overlay already tinted
+    render/get_region_at        one click lookup
+    colour/status_colours/<n>   n severity ratios -> RGBA (the map colouring pass)
+
+n is 18 (the real world) or a 1k / 10k-region world from world_gen.py. Worlds
+and simulations are seeded, and every timed simulation call starts from a fresh
+fork of the same outbreak state (forking is not timed), so results do not depend
+on how many calls a machine's calibration picks. Rendering uses SDL's dummy
+video driver and is skipped if pygame or the map assets are missing.
+
+Each benchmark runs `--repeats` timed rounds; a round repeats the operation
+until it has taken about `--min-time` seconds. Reported rates are mean ± std
+over rounds.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# Rendering benchmarks never open a real window.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from air_travel import load_air_routes
+from simulation import Simulation, build_regions_from_config
+from vector_engine import status_colours
+from world_gen import generate_world
+
+SYNTHETIC_SIZES = (1_000, 10_000)
+TICKS_PER_DAY = 20
+
+# Disease used for every simulation benchmark (mid-range stats).
+INFECTIVITY = 3.0
+SEVERITY = 0.5
+LETHALITY = 0.5
+INCUBATION_DAYS = 3
+
+# Simulation.update_one_day defaults, passed explicitly to VectorEngine.land_exports.
+EXPORT_COOLDOWN_DAYS = 8
+EXPORT_SEED_BASE = 25
+
+# Results more than this much slower than the baseline are reported as regressions.
+DEFAULT_THRESHOLD = 0.10
+
+
+def _outbreak_simulation(n: int, engine: str) -> Simulation:
+    """A seeded simulation a few weeks into an outbreak, so exports and air spread are live."""
+    if n == 18:
+        simulation = Simulation(build_regions_from_config(), engine=engine, seed=1, air_routes=load_air_routes())
+    else:
+        simulation = generate_world(n, seed=0).simulation(engine=engine, seed=1)
+    for name in simulation.region_names[:: max(1, n // 20)]:
+        simulation.seed_infection(name, 5000)
+    for _day in range(21):
+        simulation.update_one_day(INFECTIVITY, SEVERITY, LETHALITY, INCUBATION_DAYS)
+    return simulation
+
+
+class Stateful(NamedTuple):
+    """An operation that mutates state: prepare() (untimed) builds the state run() is timed on."""
+
+    prepare: object
+    run: object
+
+
+def _sim_benchmarks(n: int, engine: str):
+    prefix = f"sim/{engine}/{n}"
+
+    def tick():
+        simulation = _outbreak_simulation(n, engine)
+        rates = (INFECTIVITY / TICKS_PER_DAY, SEVERITY / TICKS_PER_DAY, LETHALITY, INCUBATION_DAYS)
+        return Stateful(simulation.fork, lambda sim: sim.update_one_day(*rates))
+
+    def day():
+        simulation = _outbreak_simulation(n, engine)
+        return Stateful(simulation.fork, lambda sim: sim.update_one_day(INFECTIVITY, SEVERITY, LETHALITY, INCUBATION_DAYS))
+
+    benchmarks = [
+        (f"{prefix}/tick", "ticks", tick),
+        (f"{prefix}/day", "days", day),
+    ]
+
+    if engine == "vector":
+        # The loop engine runs its exports inline in update_one_day, so only the vector
+        # engine has an export step that can be timed on its own.
+        def land_exports():
+            simulation = _outbreak_simulation(n, engine)
+            draws = simulation._export_draws()
+            day_count = simulation.day_count + 1
+            return Stateful(
+                simulation._vector.fork,
+                lambda vector: vector.land_exports(
+                    draws, day_count, INFECTIVITY / TICKS_PER_DAY, TICKS_PER_DAY, EXPORT_COOLDOWN_DAYS, EXPORT_SEED_BASE
+                ),
+            )
+
+        benchmarks.append((f"{prefix}/land_exports", "days", land_exports))
+
+    return benchmarks
+
+
+def _render_benchmarks():
+    def make_renderer():
+        import pygame
+        from map_system import MapRenderer
+        from region_data import REGION_CONFIG
+
+        pygame.init()
+        screen = pygame.display.set_mode((1280, 720))
+        renderer = MapRenderer(assets_dir="assets", map_size=(1280, 720), region_names=list(REGION_CONFIG))
+        rng = np.random.default_rng(0)
+        colours = {name: tuple(rgba) for name, rgba in zip(REGION_CONFIG, status_colours(rng.random(18)).tolist())}
+        return screen, renderer, colours
+
+    def draw_cold():
+        screen, renderer, colours = make_renderer()
+
+        def run():
+            renderer._tint_cache.clear()
+            renderer.draw(screen, colours)
+
+        return run
+
+    def draw_warm():
+        screen, renderer, colours = make_renderer()
+        renderer.draw(screen, colours)
+        return lambda: renderer.draw(screen, colours)
+
+    def get_region_at():
+        _screen, renderer, _colours = make_renderer()
+        rng = np.random.default_rng(0)
+        points = [tuple(p) for p in rng.integers(0, (1280, 720), size=(4096, 2)).tolist()]
+        state = {"k": 0}
+
+        def run():
+            state["k"] = (state["k"] + 1) % len(points)
+            renderer.get_region_at(points[state["k"]])
+
+        return run
+
+    return [
+        ("render/draw/cold", "frames", draw_cold),
+        ("render/draw/warm", "frames", draw_warm),
+        ("render/get_region_at", "calls", get_region_at),
+    ]
+
+
+def _colour_benchmarks():
+    def colour_pass(n):
+        def setup():
+            ratios = np.random.default_rng(0).random(n)
+            return lambda: status_colours(ratios)
+
+        return setup
+
+    return [(f"colour/status_colours/{n}", "calls", colour_pass(n)) for n in (18, *SYNTHETIC_SIZES)]
+
+
+def all_benchmarks():
+    """(name, unit, setup) for every benchmark; setup() returns the operation to time."""
+    benchmarks = []
+    for engine in Simulation.ENGINES:
+        for n in (18, *SYNTHETIC_SIZES):
+            benchmarks.extend(_sim_benchmarks(n, engine))
+    benchmarks.extend(_render_benchmarks())
+    benchmarks.extend(_colour_benchmarks())
+    return benchmarks
+
+
+def _timed_calls(operation, calls: int) -> float:
+    """Seconds spent in `calls` calls of operation (a Stateful's prepare() is not counted)."""
+    if isinstance(operation, Stateful):
+        elapsed = 0.0
+        for _ in range(calls):
+            state = operation.prepare()
+            started = time.perf_counter()
+            operation.run(state)
+            elapsed += time.perf_counter() - started
+        return elapsed
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        operation()
+    return time.perf_counter() - started
+
+
+def measure(operation, repeats: int, min_time: float) -> list[float]:
+    """Seconds per operation for each of `repeats` rounds (each round lasts >= min_time)."""
+    # Calibrate how many calls make one round.
+    calls = 1
+    while True:
+        elapsed = _timed_calls(operation, calls)
+        if elapsed >= min_time or calls >= 1_000_000:
+            break
+        calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)))
+
+    return [_timed_calls(operation, calls) / calls for _ in range(repeats)]
+
+
+def summarise(unit: str, per_op: list[float]) -> dict:
+    rates = [1.0 / t for t in per_op]
+    return {
+        "unit": unit,
+        "rounds": len(per_op),
+        "mean_seconds": statistics.fmean(per_op),
+        "std_seconds": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "per_second": statistics.fmean(rates),
+        "per_second_std": statistics.stdev(rates) if len(rates) > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    info = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import pygame
+        info["pygame"] = pygame.version.ver
+    except ImportError:
+        info["pygame"] = None
+    return info
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of benchmarks whose mean time got worse than `threshold` (fraction) vs the baseline."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"  {name:<34} (no baseline)")
+            continue
+
+        change = result["mean_seconds"] / before["mean_seconds"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  <-- REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  (faster)"
+        print(f"  {name:<34} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark simulation and rendering hot paths.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=7, help="Timed rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--json", help="Write results (and environment) to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON produced by --json to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        if not os.path.exists(args.compare):
+            raise FileNotFoundError(f"Missing baseline file: {args.compare}")
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    results = {}
+    for name, unit, setup in all_benchmarks():
+        if args.filter not in name:
+            continue
+
+        try:
+            operation = setup()
+        except (ImportError, FileNotFoundError) as e:
+            print(f"  {name:<34} skipped ({e.__class__.__name__}: {e})")
+            continue
+
+        result = summarise(unit, measure(operation, args.repeats, args.min_time))
+        results[name] = result
+        print(
+            f"  {name:<34} {result['per_second']:>12,.1f} ± {result['per_second_std']:<10,.1f} {unit}/s"
+            f"   ({result['mean_seconds'] * 1e3:.4f} ms)"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=4)
+        print(f"[+] Results written to {args.json}")
+
+    if baseline is not None:
+        print(f"Compared with {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"[!] {len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
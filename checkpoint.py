@@ -0,0 +1,128 @@
+"""
+checkpoint.py
+
+Compact, versioned binary checkpoints of a running Simulation.
+
+File layout (little-endian):
+
+    header      fixed-size struct (magic, version, counters, section offsets)
+    state       float64[n_regions, 5]   S/E/I/R/D per region
+    last_export int64[n_regions]        last export day (NEVER_EXPORTED if none)
+    airports    uint8[n_regions]        1 = open
+    names       UTF-8, newline-separated region keys
+    rng         UTF-8 JSON of the NumPy bit-generator state
+
+Every array section starts on a 64-byte boundary, so read_checkpoint(mmap=True)
+can map the compartments straight from disk without copying.
+
+Usage:
+    save_checkpoint(simulation, "run.ppck")
+    restore_checkpoint(simulation, "run.ppck")   # same world, any engine
+"""
+
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"PPCKPT\x00\x00"
+CHECKPOINT_VERSION = 1
+
+# magic, version, n_regions, day_count, tick_in_day, sim_time_ticks, total_step_count,
+# adaptive_h, then (offset, length) for: state, last_export, airports, names, rng.
+_HEADER = struct.Struct("<8sIIqqqqd10Q")
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def save_checkpoint(simulation, path: str):
+    """Write the simulation's full running state to `path`."""
+    state = simulation.export_state()
+    n = len(state["region_names"])
+
+    sections = [
+        np.ascontiguousarray(state["compartments"], dtype="<f8").tobytes(),
+        np.ascontiguousarray(state["last_export"], dtype="<i8").tobytes(),
+        np.asarray(state["airports_open"], dtype=np.uint8).tobytes(),
+        "\n".join(state["region_names"]).encode("utf-8"),
+        json.dumps(state["rng_state"]).encode("utf-8"),
+    ]
+
+    table = []
+    offset = _aligned(_HEADER.size)
+    for blob in sections:
+        table.extend((offset, len(blob)))
+        offset = _aligned(offset + len(blob))
+
+    header = _HEADER.pack(
+        MAGIC,
+        CHECKPOINT_VERSION,
+        n,
+        state["day_count"],
+        state["tick_in_day"],
+        state["sim_time_ticks"],
+        state["total_step_count"],
+        state["adaptive_h"],
+        *table,
+    )
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for blob, start in zip(sections, table[0::2]):
+            f.write(b"\x00" * (start - f.tell()))
+            f.write(blob)
+
+
+def read_checkpoint(path: str, mmap: bool = False) -> dict:
+    """
+    Read a checkpoint into the dict shape used by Simulation.import_state().
+
+    mmap=True maps the compartment array read-only from disk instead of loading it,
+    which is useful for inspecting large checkpoints or forking many runs from one.
+    """
+    with open(path, "rb") as f:
+        raw_header = f.read(_HEADER.size)
+        if len(raw_header) < _HEADER.size or raw_header[:8] != MAGIC:
+            raise ValueError(f"Not a simulation checkpoint: {path}")
+
+        fields = _HEADER.unpack(raw_header)
+        version = fields[1]
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION}): {path}")
+
+        n = fields[2]
+        table = fields[8:]
+        (state_off, _), (export_off, _), (air_off, _), (names_off, names_len), (rng_off, rng_len) = zip(
+            table[0::2], table[1::2]
+        )
+
+        f.seek(names_off)
+        region_names = f.read(names_len).decode("utf-8").split("\n") if n else []
+        f.seek(rng_off)
+        rng_state = json.loads(f.read(rng_len).decode("utf-8"))
+
+    if mmap:
+        compartments = np.memmap(path, dtype="<f8", mode="r", offset=state_off, shape=(n, 5))
+    else:
+        compartments = np.fromfile(path, dtype="<f8", count=n * 5, offset=state_off).reshape(n, 5)
+
+    return {
+        "region_names": region_names,
+        "compartments": compartments,
+        "last_export": np.fromfile(path, dtype="<i8", count=n, offset=export_off),
+        "airports_open": np.fromfile(path, dtype=np.uint8, count=n, offset=air_off).astype(bool),
+        "day_count": fields[3],
+        "tick_in_day": fields[4],
+        "sim_time_ticks": fields[5],
+        "total_step_count": fields[6],
+        "adaptive_h": fields[7],
+        "rng_state": rng_state,
+    }
+
+
+def restore_checkpoint(simulation, path: str):
+    """Load a checkpoint into an existing Simulation built for the same world."""
+    simulation.import_state(read_checkpoint(path))
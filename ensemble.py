@@ -0,0 +1,213 @@
+"""
+ensemble.py
+
+Monte Carlo ensembles: many independent seeded runs of one disease/start-region
+pair, spread across a process pool.
+
+Usage:
+    python ensemble.py SavedDiseases/MyDisease.json --start-region china --runs 200 --seed 42
+
+Each run gets its own seed derived from the master seed, so the whole ensemble
+reproduces exactly no matter how many workers are used or in which order runs
+finish. Summaries stream back as runs complete and quantiles are kept up to date
+on the fly (EnsembleStats).
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from headless import load_disease, run_headless
+from simulation import Simulation
+
+
+class RunSummary(NamedTuple):
+    run_index: int
+    seed: int
+    days_simulated: int
+    wipe_out_day: Optional[int]  # first day with < 1 living person worldwide, None if never
+    peak_infected: float
+    peak_day: int
+    final_deaths: float
+
+
+# Quantiles reported by default (5th percentile, median, 95th percentile).
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+def run_seeds(master_seed: int, runs: int) -> list[int]:
+    """Derive one independent 64-bit seed per run from the master seed."""
+    children = np.random.SeedSequence(master_seed).spawn(runs)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+
+def run_one(
+    run_index: int,
+    seed: int,
+    disease_data: dict,
+    start_region: str,
+    days: int,
+    engine: str = "loop",
+    per_day: bool = False,
+) -> RunSummary:
+    """Run a single seeded simulation and reduce it to a RunSummary (runs inside a worker)."""
+    tracker = {"peak_infected": 0.0, "peak_day": 0, "wipe_out_day": None}
+
+    def on_day(simulation):
+        # Running world totals (O(1)), so a day costs nothing extra for big worlds.
+        totals = simulation.totals
+        infected = totals.infected
+        living = totals.living
+
+        if infected > tracker["peak_infected"]:
+            tracker["peak_infected"] = infected
+            tracker["peak_day"] = simulation.day_count
+
+        # Nothing left to simulate once the world is wiped out.
+        if living < 1.0:
+            tracker["wipe_out_day"] = simulation.day_count
+            return True
+        return False
+
+    simulation = run_headless(
+        disease_data, start_region, days, engine=engine, per_day=per_day, on_day=on_day, seed=seed
+    )
+
+    return RunSummary(
+        run_index=run_index,
+        seed=seed,
+        days_simulated=simulation.day_count,
+        wipe_out_day=tracker["wipe_out_day"],
+        peak_infected=tracker["peak_infected"],
+        peak_day=tracker["peak_day"],
+        final_deaths=simulation.totals.dead,
+    )
+
+
+def run_ensemble(
+    disease_data: dict,
+    start_region: str,
+    runs: int,
+    master_seed: int,
+    days: int = 730,
+    workers: Optional[int] = None,
+    engine: str = "loop",
+    per_day: bool = False,
+):
+    """
+    Yield a RunSummary for every run as soon as it finishes.
+
+    Runs are independent, so throughput scales with the number of worker processes.
+    Completion order varies between executions; sort by run_index if order matters.
+    """
+    seeds = run_seeds(master_seed, runs)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_one, idx, seed, disease_data, start_region, days, engine, per_day)
+            for idx, seed in enumerate(seeds)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+class EnsembleStats:
+    """
+    Running quantiles over streamed RunSummary results.
+
+    Values are kept in sorted lists (insertion is cheap for hundreds to thousands of
+    runs), so quantiles can be read at any point and do not depend on arrival order.
+    """
+
+    METRICS = ("wipe_out_day", "peak_infected", "peak_day", "final_deaths")
+
+    def __init__(self):
+        self.runs = 0
+        self.wiped_out = 0
+        self._sorted: dict[str, list[float]] = {metric: [] for metric in self.METRICS}
+
+    def add(self, summary: RunSummary):
+        self.runs += 1
+        if summary.wipe_out_day is not None:
+            self.wiped_out += 1
+
+        for metric in self.METRICS:
+            value = getattr(summary, metric)
+            # Runs that never wiped out have no wipe-out day to rank.
+            if value is not None:
+                bisect.insort(self._sorted[metric], value)
+
+    def quantile(self, metric: str, q: float):
+        """Linear-interpolated quantile (same convention as numpy's default); None if no data."""
+        values = self._sorted[metric]
+        if not values:
+            return None
+
+        pos = q * (len(values) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(values) - 1)
+        frac = pos - lo
+        return values[lo] + (values[hi] - values[lo]) * frac
+
+    def quantiles(self, qs=DEFAULT_QUANTILES) -> dict:
+        return {metric: {str(q): self.quantile(metric, q) for q in qs} for metric in self.METRICS}
+
+    def to_dict(self, qs=DEFAULT_QUANTILES) -> dict:
+        return {"runs": self.runs, "wiped_out": self.wiped_out, "quantiles": self.quantiles(qs)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Monte Carlo ensemble of a saved disease.")
+    parser.add_argument("disease_file", help="Path to a SavedDiseases/*.json file")
+    parser.add_argument("--start-region", required=True, help="Region key to seed, e.g. china")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="Master seed; the same seed reproduces the ensemble")
+    parser.add_argument("--days", type=int, default=730, help="Maximum in-game days per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--engine", choices=Simulation.ENGINES, default="loop")
+    parser.add_argument("--per-day", action="store_true", help="One full-day step per day instead of game ticks")
+    parser.add_argument("--out", help="Optional JSON file for per-run summaries and final quantiles")
+    args = parser.parse_args(argv)
+
+    disease_data = load_disease(args.disease_file)
+    stats = EnsembleStats()
+    summaries = []
+
+    started = time.perf_counter()
+    for summary in run_ensemble(
+        disease_data,
+        args.start_region,
+        args.runs,
+        args.seed,
+        days=args.days,
+        workers=args.workers,
+        engine=args.engine,
+        per_day=args.per_day,
+    ):
+        stats.add(summary)
+        summaries.append(summary)
+        median_deaths = stats.quantile("final_deaths", 0.5)
+        print(f"[{stats.runs}/{args.runs}] run {summary.run_index}: median final deaths so far {median_deaths:,.0f}")
+    elapsed = time.perf_counter() - started
+
+    result = stats.to_dict()
+    print(json.dumps(result, indent=4))
+    print(f"[+] {args.runs} runs in {elapsed:.2f}s")
+
+    if args.out:
+        summaries.sort(key=lambda s: s.run_index)
+        with open(args.out, "w") as f:
+            json.dump({**result, "runs_detail": [s._asdict() for s in summaries]}, f, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
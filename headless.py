@@ -0,0 +1,156 @@
+"""
+headless.py
+
+Runs a saved disease without a window, menus or frame pacing.
+
+Usage:
+    python headless.py SavedDiseases/MyDisease.json --start-region china --days 365 --out run.csv
+
+The simulation is stepped exactly the way run_map_test in main.py steps it
+(per-tick rates, TICKS_PER_DAY ticks per day), just as fast as the CPU allows.
+Only simulation.py is imported, so pygame/SDL are never loaded.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from air_travel import load_air_routes
+from history import HistoryRecorder
+from simulation import Simulation, build_regions_from_config
+from vector_engine import COMPARTMENTS
+
+# Must match the tick smoothing used by run_map_test in main.py.
+TICKS_PER_DAY = 20
+
+
+def load_disease(path: str) -> dict:
+    """Read a SavedDiseases JSON file."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def disease_rates(disease_data: dict) -> dict:
+    """Pull the simulation inputs out of a disease file, with the same defaults as main.py."""
+    return {
+        "infectivity_rate": disease_data["infectivity_rate"],
+        "severity_rate": disease_data["severity_rate"],
+        "lethality_rate": disease_data["lethality_rate"],
+        "incubation_days": disease_data.get("incubation_days", 3),
+        "initial_infected": disease_data.get("initial_infected", 1),
+    }
+
+
+def run_headless(
+    disease_data: dict,
+    start_region: str,
+    days: int,
+    engine: str = "loop",
+    per_day: bool = False,
+    on_day=None,
+    seed=None,
+    integrator: str = "euler",
+) -> Simulation:
+    """
+    Run `days` in-game days from a single outbreak region and return the Simulation.
+
+    per_day=False matches the game (TICKS_PER_DAY small steps per day).
+    per_day=True takes one full-day step per day, which is faster but coarser.
+    on_day(simulation) is called after every completed day; returning True stops the run early.
+    seed makes land and air spread (the only random parts) reproducible.
+    integrator="rk45" (vector engine only) uses adaptive steps instead of one Euler step per call.
+    """
+    regions = build_regions_from_config()
+    if start_region not in regions:
+        raise ValueError(
+            f"Unknown start region '{start_region}'. Expected one of: {', '.join(regions)}"
+        )
+
+    rates = disease_rates(disease_data)
+    simulation = Simulation(
+        regions=regions,
+        engine=engine,
+        seed=seed,
+        air_routes=load_air_routes(),
+        integrator=integrator,
+    )
+    simulation.seed_infection(start_region, rates["initial_infected"])
+
+    if per_day:
+        steps_per_day = 1
+        infectivity_rate = rates["infectivity_rate"]
+        severity_rate = rates["severity_rate"]
+    else:
+        steps_per_day = TICKS_PER_DAY
+        infectivity_rate = rates["infectivity_rate"] / TICKS_PER_DAY
+        severity_rate = rates["severity_rate"] / TICKS_PER_DAY
+
+    for _day in range(days):
+        for _step in range(steps_per_day):
+            simulation.update_one_day(
+                infectivity_rate,
+                severity_rate,
+                rates["lethality_rate"],
+                rates["incubation_days"],
+            )
+        if on_day is not None and on_day(simulation):
+            break
+
+    return simulation
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a saved disease headlessly and write per-day results.")
+    parser.add_argument("disease_file", help="Path to a SavedDiseases/*.json file")
+    parser.add_argument("--start-region", required=True, help="Region key to seed, e.g. china")
+    parser.add_argument("--days", type=int, default=365, help="Number of in-game days to simulate")
+    parser.add_argument("--out", required=True, help="CSV file for per-day, per-region results")
+    parser.add_argument("--engine", choices=Simulation.ENGINES, default="loop")
+    parser.add_argument("--per-day", action="store_true", help="One full-day step per day instead of game ticks")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for a reproducible run")
+    parser.add_argument("--integrator", choices=Simulation.INTEGRATORS, default="euler")
+    parser.add_argument("--history", help="Optional directory for a columnar history (see history.py)")
+    args = parser.parse_args(argv)
+
+    disease_data = load_disease(args.disease_file)
+    history = None
+    if args.history:
+        history = HistoryRecorder(
+            args.history, list(build_regions_from_config()), interval_days=disease_data.get("log_interval_days", 5)
+        )
+
+    with open(args.out, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["day", "region", *COMPARTMENTS])
+
+        def write_day(simulation):
+            day = simulation.day_count
+            for name, rgn in simulation.regions.items():
+                writer.writerow([day, name, rgn.susceptible, rgn.exposed, rgn.infected, rgn.recovered, rgn.dead])
+            if history is not None:
+                history.maybe_record(simulation)
+
+        started = time.perf_counter()
+        simulation = run_headless(
+            disease_data,
+            args.start_region,
+            args.days,
+            engine=args.engine,
+            per_day=args.per_day,
+            on_day=write_day,
+            seed=args.seed,
+            integrator=args.integrator,
+        )
+        elapsed = time.perf_counter() - started
+
+    if history is not None:
+        history.close()
+
+    print(f"[+] Simulated {args.days} days in {elapsed:.2f}s ({simulation.total_step_count} steps) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
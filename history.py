@@ -0,0 +1,153 @@
+"""
+history.py
+
+Streaming per-region history for post-game statistics and graphs.
+
+HistoryRecorder samples S/E/I/R/D for every region every `interval_days` and
+appends them to one typed column file per compartment:
+
+    <out_dir>/manifest.json    region names, columns, dtype, row count, wipe-out order
+    <out_dir>/day.i32          int32[rows]             day of each sample
+    <out_dir>/infected.f64     float64[rows, regions]  (same for the other compartments)
+
+Samples are buffered in a fixed-size chunk and flushed with a plain append, so
+memory stays constant however long the game runs and nothing already on disk
+is rewritten. read_history() memory-maps the columns for graphing.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from vector_engine import COMPARTMENTS, S, E, I, R
+
+HISTORY_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DAY_FILE = "day.i32"
+
+
+def _column_file(compartment: str) -> str:
+    return f"{compartment}.f64"
+
+
+class HistoryRecorder:
+    """Append-only, chunked recorder of per-region compartments."""
+
+    def __init__(self, out_dir: str, region_names: list[str], interval_days: int = 5, chunk_rows: int = 64):
+        if interval_days <= 0:
+            raise ValueError(f"interval_days must be positive, got {interval_days}")
+
+        self.out_dir = out_dir
+        self.region_names = list(region_names)
+        self.interval_days = int(interval_days)
+        self.chunk_rows = int(chunk_rows)
+
+        # Regions in the order their living population dropped below one person.
+        self.wiped_out_order: list[str] = []
+        self._wiped_out = np.zeros(len(self.region_names), dtype=bool)
+
+        self.rows_written = 0
+        self._last_day = None
+        self._buffered = 0
+        self._days = np.empty(self.chunk_rows, dtype="<i4")
+        self._chunk = np.empty((self.chunk_rows, len(self.region_names), 5), dtype="<f8")
+
+        # Start a fresh recording (a new game should not append to an old one).
+        os.makedirs(self.out_dir, exist_ok=True)
+        for name in (DAY_FILE, *(_column_file(c) for c in COMPARTMENTS)):
+            open(os.path.join(self.out_dir, name), "wb").close()
+        self._write_manifest()
+
+    def record(self, simulation):
+        """Append the simulation's current state as one sample (regardless of interval)."""
+        state = simulation.compartment_array()
+        self._days[self._buffered] = simulation.day_count
+        self._chunk[self._buffered] = state
+        self._buffered += 1
+        self._last_day = simulation.day_count
+        self._track_wipe_outs(state)
+
+        if self._buffered == self.chunk_rows:
+            self.flush()
+
+    def maybe_record(self, simulation):
+        """Call after every simulation update; samples once per `interval_days` in-game days."""
+        day = simulation.day_count
+        if day == self._last_day or day % self.interval_days != 0:
+            return
+        self.record(simulation)
+
+    def _track_wipe_outs(self, state):
+        living = state[:, S] + state[:, E] + state[:, I] + state[:, R]
+        newly = np.flatnonzero((living < 1.0) & ~self._wiped_out)
+        for idx in newly.tolist():
+            self._wiped_out[idx] = True
+            self.wiped_out_order.append(self.region_names[idx])
+
+    def flush(self):
+        """Append buffered samples to the column files and update the manifest."""
+        if self._buffered == 0:
+            return
+
+        rows = self._buffered
+        with open(os.path.join(self.out_dir, DAY_FILE), "ab") as f:
+            self._days[:rows].tofile(f)
+        for col, compartment in enumerate(COMPARTMENTS):
+            with open(os.path.join(self.out_dir, _column_file(compartment)), "ab") as f:
+                np.ascontiguousarray(self._chunk[:rows, :, col]).tofile(f)
+
+        self.rows_written += rows
+        self._buffered = 0
+        self._write_manifest()
+
+    def close(self):
+        self.flush()
+
+    def _write_manifest(self):
+        manifest = {
+            "version": HISTORY_VERSION,
+            "region_names": self.region_names,
+            "columns": list(COMPARTMENTS),
+            "dtype": "<f8",
+            "interval_days": self.interval_days,
+            "rows": self.rows_written,
+            "wiped_out_order": self.wiped_out_order,
+        }
+        # Write-then-rename so a reader never sees a half-written manifest.
+        path = os.path.join(self.out_dir, MANIFEST_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, path)
+
+
+def read_history(out_dir: str) -> dict:
+    """
+    Memory-map a recorded history.
+
+    Returns the manifest fields plus "day" (int32[rows]) and one float64[rows, regions]
+    array per compartment name. Only rows listed in the manifest are mapped.
+    """
+    with open(os.path.join(out_dir, MANIFEST_NAME), "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != HISTORY_VERSION:
+        raise ValueError(f"Unsupported history version {manifest.get('version')}: {out_dir}")
+
+    rows = manifest["rows"]
+    n = len(manifest["region_names"])
+    history = dict(manifest)
+
+    if rows == 0:
+        history["day"] = np.empty(0, dtype="<i4")
+        for compartment in manifest["columns"]:
+            history[compartment] = np.empty((0, n), dtype=manifest["dtype"])
+        return history
+
+    history["day"] = np.memmap(os.path.join(out_dir, DAY_FILE), dtype="<i4", mode="r", shape=(rows,))
+    for compartment in manifest["columns"]:
+        history[compartment] = np.memmap(
+            os.path.join(out_dir, _column_file(compartment)), dtype=manifest["dtype"], mode="r", shape=(rows, n)
+        )
+    return history
@@ -0,0 +1,63 @@
+"""
+lru.py
+
+Bounded least-recently-used cache shared by the render-side caches
+(map_system.TintCache for tinted region overlays, text_cache.TextCache for
+rendered text).
+
+Values are built on a miss by a caller-supplied function and kept until
+`max_entries` newer keys push them out. hits / misses / evictions are counted
+for profiling and reported by stats().
+
+Usage:
+    cache = LRUCache(max_entries=256)
+    surface = cache.get_or_build(key, build, *args)   # build(*args) on a miss
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded LRU of built values (see module docstring)."""
+
+    def __init__(self, max_entries: int):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, key, build, *args):
+        """The value cached for `key`; on a miss build(*args) is stored and returned."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = build(*args)
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,4 +1,6 @@
 import pygame, sys, hashlib, os, json
+from assets import AssetManager
+from text_cache import TextCache
 
 # Global setup (window, fonts, colours)
 pygame.init()
@@ -10,6 +12,14 @@ font2big = pygame.font.Font("assets/BR.ttf", 75)
 font2 = pygame.font.Font("assets/BR.ttf", 40)
 BLACK = (0, 0, 0)
 
+# Shared image loader: menu backgrounds are decoded/scaled once per run (and cached
+# pre-scaled on disk between runs), and the map renderer reuses the same cache.
+assets = AssetManager(cache_dir=os.path.join("assets", ".cache"))
+MENU_BACKGROUNDS = [os.path.join("assets", f"background{i}.png") for i in range(1, 5)]
+
+# Rendered text is cached by (font, text, colour): labels are rasterized once, then blitted.
+text_cache = TextCache()
+
 # Hashed credentials (could later come from a file/database)
 USERNAME = "user123"
 HASH_PASSWORD = hashlib.sha256("pass123".encode()).hexdigest()
@@ -23,8 +33,7 @@ def login_screen():
     user_box = pygame.Rect(200, 350, 200, 40)
     pass_box = pygame.Rect(200, 410, 200, 40)
 
-    background = pygame.image.load("assets/background.png")
-    background = pygame.transform.scale(background, (WIDTH, HEIGHT))
+    background = assets.load("assets/background.png", (WIDTH, HEIGHT), alpha=False, smooth=False)
 
     while True:
         screen.blit(background, (0, 0))
@@ -78,8 +87,7 @@ def login_screen():
 def Play():
 
     def difficultyselect():
-        background3 = pygame.image.load("assets/background3.png")
-        background3 = pygame.transform.scale(background3, (WIDTH, HEIGHT))
+        background3 = assets.load("assets/background3.png", (WIDTH, HEIGHT), alpha=False, smooth=False)
         # Default to None so the function always returns a valid value (prevents UnboundLocalError on ESC).
         difficulty = None
 
@@ -104,14 +112,14 @@ def Play():
         running = True
         while running:
             screen.blit(background3, (0, 0))   
-            text = font2big.render("Select Difficulty", True, (255, 255, 255))
+            text = text_cache.render(font2big, "Select Difficulty", (255, 255, 255))
             screen.blit(text, (WIDTH//2 - text.get_width()//2, 20))
             for diff in difficulties:
                 pygame.draw.rect(screen, diff["color"], diff["rect"])
-                name_text = font2.render(diff["name"], True, (255, 255, 255))
+                name_text = text_cache.render(font2, diff["name"], (255, 255, 255))
                 screen.blit(name_text, (diff["rect"].centerx - name_text.get_width()//2,
                                     diff["rect"].centery - name_text.get_height()//2))
-                desc_text = font.render(diff["desc"], True, (255, 255, 255))
+                desc_text = text_cache.render(font, diff["desc"], (255, 255, 255))
                 screen.blit(desc_text, (diff["rect"].centerx - desc_text.get_width()//2,
                                     diff["rect"].bottom + 10))
             pygame.display.flip()
@@ -140,8 +148,7 @@ def Play():
         return difficulty
     
     def diseasesetup():
-        background4 = pygame.image.load("assets/background4.png")
-        background4 = pygame.transform.scale(background4, (WIDTH, HEIGHT)) 
+        background4 = assets.load("assets/background4.png", (WIDTH, HEIGHT), alpha=False, smooth=False)
 
         dnamebox = pygame.Rect(0, 0, 400, 40)
         dnamebox.center = (WIDTH // 2, HEIGHT // 2)
@@ -247,8 +254,7 @@ def Play():
     return True
 
 def H2P():
-    background2 = pygame.image.load("assets/background2.png")
-    background2 = pygame.transform.scale(background2, (WIDTH, HEIGHT))
+    background2 = assets.load("assets/background2.png", (WIDTH, HEIGHT), alpha=False, smooth=False)
     running = True
 
 
@@ -277,18 +283,19 @@ def H2P():
     "Press ESC to return to the main menu."
     ]
 
-    while running:
-        screen.blit(background2, (0, 0)) 
-        text = font2.render("How To Play", True, (0, 0, 0))
-        screen.blit(text, (8, 0))
+    # The page never changes, so render it once.
+    page = background2.copy()
+    page.blit(text_cache.render(font2, "How To Play", (0, 0, 0)), (8, 0))
 
-        # Formatting loop 
-        y_offset = 65
-        for line in h2ptext:
-            text_surface = font.render(line, True, BLACK)
-            screen.blit(text_surface, (20, y_offset))
-            y_offset += text_surface.get_height() + 5
+    # Formatting loop 
+    y_offset = 65
+    for line in h2ptext:
+        text_surface = text_cache.render(font, line, BLACK)
+        page.blit(text_surface, (20, y_offset))
+        y_offset += text_surface.get_height() + 5
 
+    while running:
+        screen.blit(page, (0, 0))
         pygame.display.flip()
         
         for event in pygame.event.get():
@@ -317,8 +324,8 @@ def Achievements():
 
 def main_menu():
     # Main navigation screen (Iteration 1 evidence). Used as the entry point for the game flow.
-    background = pygame.image.load("assets/background1.png")
-    background = pygame.transform.scale(background, (WIDTH, HEIGHT))
+    # Warm every menu background in one parallel batch; later screens hit the cache.
+    background, *_others = assets.load_many(MENU_BACKGROUNDS, (WIDTH, HEIGHT), alpha=False, smooth=False)
 
     buttons = {
         "Play": pygame.Rect(540, 300, 200, 60),
@@ -328,7 +335,7 @@ def main_menu():
 
     while True:
         screen.blit(background, (0, 0))
-        title = font2.render("Pandemic Protocol", True, (0, 0, 0))
+        title = text_cache.render(font2, "Pandemic Protocol", (0, 0, 0))
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 200))
 
         for event in pygame.event.get():
@@ -349,7 +356,7 @@ def main_menu():
 
         for name, rect in buttons.items():
             pygame.draw.rect(screen, (0, 100, 200), rect)
-            label = font.render(name, True, (255, 255, 255))
+            label = text_cache.render(font, name, (255, 255, 255))
             screen.blit(
                 label,
                 (rect.centerx - label.get_width() // 2,
@@ -360,7 +367,11 @@ def main_menu():
 
 def run_map_test(disease_file_path):
     from map_system import MapRenderer, Simulation, build_regions_from_config
+    from air_travel import load_air_routes
+    from history import HistoryRecorder
     from region_data import REGION_CONFIG
+    from sim_worker import SPEEDS, SimulationWorker
+    from profiling import PhaseTimer
     with open(disease_file_path, "r") as f:
         disease_data = json.load(f)
 
@@ -369,20 +380,37 @@ def run_map_test(disease_file_path):
     lethality_rate = disease_data["lethality_rate"]
     incubation_days = disease_data.get("incubation_days", 3)
     initial_infected = disease_data.get("initial_infected", 1)
+    log_interval_days = disease_data.get("log_interval_days", 5)
+    # "rk45" (adaptive integrator, vector engine) lets fast-forward run whole days in one step.
+    integrator = disease_data.get("integrator", "euler")
     difficulty_label = str(disease_data.get("difficulty", "")).upper()
+    # "profile": true times every frame/simulation phase (F3 shows the table; a JSON
+    # summary is written next to the disease file on exit).
+    profiler = PhaseTimer() if disease_data.get("profile", False) else None
 
     # Single source of truth: REGION_CONFIG keys must match <key>_mask.png
     region_names = list(REGION_CONFIG.keys())
     regions = build_regions_from_config()
 
     # Simulation scaffold: tick loop exists now; disease rules come next.
-    simulation = Simulation(regions=regions)
+    simulation = Simulation(
+        regions=regions,
+        air_routes=load_air_routes(),
+        engine="vector" if integrator == "rk45" else "loop",
+        integrator=integrator,
+    )
+    simulation.profiler = profiler
     map_renderer = MapRenderer(
         assets_dir="assets",
         map_size=(WIDTH, HEIGHT),
-        region_names=region_names
+        region_names=region_names,
+        assets=assets,
     )
 
+    # Per-region history for post-game graphs, streamed next to the disease file.
+    history_dir = os.path.splitext(disease_file_path)[0] + "_history"
+    history = HistoryRecorder(history_dir, region_names, interval_days=log_interval_days)
+
     clock = pygame.time.Clock()
 
     selected_region = None
@@ -396,16 +424,63 @@ def run_map_test(disease_file_path):
     HUD_Y = HEIGHT - HUD_H
     PROGRESS_H = 16
     TICKS_PER_SECOND = 10
-    TICK_INTERVAL = 1.0 / TICKS_PER_SECOND
     TICKS_PER_DAY = 20
 
-    accumulator = 0.0
-    tick_count = 0
-    day_count = 0
+    def run_one_tick(sim):
+        # Run one small disease step every tick so stats/colours move smoothly.
+        sim.update_one_day(
+            infectivity_rate / TICKS_PER_DAY,
+            severity_rate / TICKS_PER_DAY,
+            lethality_rate,
+            incubation_days,
+        )
+
+    def run_one_day(sim):
+        # Full-day rates: the same day as TICKS_PER_DAY ticks, in one call.
+        sim.update_one_day(infectivity_rate, severity_rate, lethality_rate, incubation_days)
+
+    # At high speed whole days can be collapsed into one step, but only when that is as
+    # accurate as ticking: the adaptive integrator treats each call's span as continuous
+    # time (the clamped Euler step does not), and the simulation must recognise the
+    # full-day rates as per-day (it assumes per-tick when both are below 0.5).
+    can_collapse_days = integrator == "rk45" and (infectivity_rate >= 0.5 or severity_rate >= 0.5)
+
+    # The simulation ticks on its own thread; each frame draws its latest snapshot,
+    # so a slow frame never delays ticks and a burst of ticks never stalls a frame.
+    # The worker also owns the history recorder (it samples after each tick).
+    sim_worker = SimulationWorker(
+        simulation,
+        step=run_one_tick,
+        ticks_per_second=TICKS_PER_SECOND,
+        ticks_per_day=TICKS_PER_DAY,
+        history=history,
+        step_day=run_one_day if can_collapse_days else None,
+    )
+    sim_worker.start()
+
+    # Speed keys 1-4 -> 1x / 2x / 8x / max.
+    speed_labels = list(SPEEDS)
+    speed_keys = {pygame.K_1: 0, pygame.K_2: 1, pygame.K_3: 2, pygame.K_4: 3}
+    speed_label = speed_labels[0]
+
+    # Screen rects covered by prompt/message text last frame (restored from the map cache).
+    overlay_rects = []
+
+    # What the day box / HUD strip currently show on screen (None = not drawn yet).
+    # They are only redrawn when that changes or the map was re-blitted over them.
+    DAY_BOX = pygame.Rect(1080, 10, 190, 50)
+    HUD_RECT = pygame.Rect(0, HUD_Y, WIDTH, HUD_H)
+    shown_day_box = None
+    shown_hud = None
+
+    # Profiling overlay (only available when profiling is on).
+    show_profile = profiler is not None
+    profile_font = pygame.font.SysFont("monospace", 14) if profiler is not None else None
 
     def handle_events():
         """Input handling. First land click selects the outbreak start and begins the tick clock."""
-        nonlocal selected_region, start_region, simulation_started, start_message, start_message_timer
+        nonlocal selected_region, start_region, simulation_started, start_message, start_message_timer, speed_label
+        nonlocal show_profile
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -414,6 +489,13 @@ def run_map_test(disease_file_path):
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return False
 
+            if event.type == pygame.KEYDOWN and event.key in speed_keys:
+                speed_label = speed_labels[speed_keys[event.key]]
+                sim_worker.set_speed(SPEEDS[speed_label])
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler is not None:
+                show_profile = not show_profile
+
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 clicked_region = map_renderer.get_region_at(event.pos)
                 selected_region = clicked_region
@@ -422,87 +504,94 @@ def run_map_test(disease_file_path):
                     start_region = clicked_region
                     simulation_started = True
 
-                    region_obj = regions[start_region]
-                    seed = min(initial_infected, region_obj.susceptible)
-                    region_obj.susceptible -= seed
-                    region_obj.infected += seed
+                    # Applied on the simulation thread, which also takes the day 0 sample.
+                    sim_worker.seed(start_region, initial_infected)
 
                     start_message = f"Outbreak starts in {start_region.replace('_',' ').title()}"
                     start_message_timer = 180
         return True
 
-    def update_simulation(dt):
-        """Tick pacing + day counter. Time only advances once a start region is chosen."""
-        nonlocal accumulator, tick_count, day_count
-
-        accumulator += dt
-
-        if simulation_started:
-            while accumulator >= TICK_INTERVAL:
-                # simulation.update_one_tick()  # Removed as per instruction
-                tick_count += 1
-
-                # Run one small disease step every tick so stats/colours move smoothly.
-                simulation.update_one_day(
-                    infectivity_rate / TICKS_PER_DAY,
-                    severity_rate / TICKS_PER_DAY,
-                    lethality_rate,
-                    incubation_days,
-                )
-
-                if tick_count % TICKS_PER_DAY == 0:
-                    day_count += 1
-
-                accumulator -= TICK_INTERVAL
-        else:
-            accumulator = 0.0
-
-    def resolve_display_stats():
+    def resolve_display_stats(snapshot):
         """Returns the label + infected/dead/alive values for the HUD (region view or global totals)."""
         if selected_region is None:
             display_region = "Global"
-            # Simulation uses floats internally; HUD uses ints for readability.
-            display_infected = int(sum(r.infected for r in regions.values()))
-            display_dead = int(sum(r.dead for r in regions.values()))
-            display_population = int(
-                sum((r.susceptible + r.exposed + r.infected + r.recovered) for r in regions.values())
-            )
-            return display_region, display_infected, display_dead, display_population
+            infected, dead, living = snapshot.global_totals()
+        else:
+            display_region = selected_region.replace("_", " ").title()
+            infected, dead, living = snapshot.region_totals(selected_region)
 
-        r = regions[selected_region]
-        display_region = selected_region.replace("_", " ").title()
         # Simulation uses floats internally; HUD uses ints for readability.
-        display_infected = int(r.infected)
-        display_dead = int(r.dead)
-        display_population = int(r.susceptible + r.exposed + r.infected + r.recovered)
-        return display_region, display_infected, display_dead, display_population
+        return display_region, int(infected), int(dead), int(living)
 
-    def draw_frame(display_region, display_infected, display_dead, display_population):
-        """Draws the map, prompts/messages, day box, and HUD. Layout remains hard-coded."""
-        nonlocal start_message_timer
+    def draw_frame(snapshot, display_region, display_infected, display_dead, display_population, mark=0):
+        """Draws the map, prompts/messages, day box, and HUD. Returns the screen rects that changed."""
+        nonlocal start_message_timer, overlay_rects, shown_day_box, shown_hud
 
-        region_colours = {name: r.colour_rgba for name, r in regions.items()}
-        map_renderer.draw(screen, region_colours)
+        dirty_rects = map_renderer.draw_dirty(screen, snapshot.colours)
+        if profiler is not None:
+            mark = profiler.lap("frame.map", mark)
+
+        # Text drawn straight onto the map last frame is erased by restoring the composed
+        # map underneath it (the map itself is only re-blitted where a region changed).
+        for rect in overlay_rects:
+            map_renderer.restore(screen, rect)
+        dirty_rects.extend(overlay_rects)
+        overlay_rects = []
 
         # Start prompt (shown until the player chooses a start region)
         if not simulation_started:
-            prompt = font.render("Select a country to start the outbreak", True, (255, 255, 255))
-            screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, 580))
+            prompt = text_cache.render(font, "Select a country to start the outbreak", (255, 255, 255))
+            overlay_rects.append(screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, 580)))
 
         # Start message (fades out)
         if start_message_timer > 0:
             alpha = int(255 * (start_message_timer / 180))
-            surf = font.render(start_message, True, (255, 255, 255))
+            # Copy: the cached surface is shared and set_alpha would change it for everyone.
+            surf = text_cache.render(font, start_message, (255, 255, 255)).copy()
             surf.set_alpha(alpha)
-            screen.blit(surf, (20, 20))
+            overlay_rects.append(screen.blit(surf, (20, 20)))
             start_message_timer -= 1
 
-        # Day box
-        pygame.draw.rect(screen, (40, 40, 40), (1080, 10, 190, 50))
-        pygame.draw.rect(screen, (0, 0, 0), (1080, 10, 190, 50), 2)
-        day_text = f"Day {day_count}" if simulation_started else "Day 0"
-        screen.blit(font.render(day_text, True, (255, 255, 255)), (1090, 22))
-
+        dirty_rects.extend(overlay_rects)
+        if profiler is not None:
+            mark = profiler.lap("frame.text", mark)
+
+        # Day box and bottom HUD are opaque; redraw them only if what they show changed
+        # or something underneath (map regions, overlays) was redrawn over them this frame.
+        day_text = f"Day {snapshot.day_count}" if simulation_started else "Day 0"
+        day_box_state = (day_text, speed_label)
+        if day_box_state != shown_day_box or DAY_BOX.collidelist(dirty_rects) != -1:
+            draw_day_box(day_text)
+            shown_day_box = day_box_state
+            dirty_rects.append(DAY_BOX)
+
+        hud_state = (display_region, display_infected, display_dead, display_population)
+        if hud_state != shown_hud or HUD_RECT.collidelist(dirty_rects) != -1:
+            draw_hud(display_region, display_infected, display_dead, display_population)
+            shown_hud = hud_state
+            dirty_rects.append(HUD_RECT)
+
+        if profiler is not None:
+            mark = profiler.lap("frame.hud", mark)
+
+        # Profiling table: drawn over the map like the other overlays, so it is erased
+        # by restoring the map underneath next frame.
+        if show_profile:
+            rect = profiler.draw_overlay(screen, profile_font)
+            overlay_rects.append(rect)
+            dirty_rects.append(rect)
+            profiler.lap("frame.overlay", mark)
+
+        return dirty_rects
+
+    def draw_day_box(day_text):
+        pygame.draw.rect(screen, (40, 40, 40), DAY_BOX)
+        pygame.draw.rect(screen, (0, 0, 0), DAY_BOX, 2)
+        screen.blit(text_cache.render(font, day_text, (255, 255, 255)), (1090, 22))
+        speed_surf = text_cache.render(font, speed_label, (200, 200, 200))
+        screen.blit(speed_surf, (1260 - speed_surf.get_width(), 22))
+
+    def draw_hud(display_region, display_infected, display_dead, display_population):
         # Bottom HUD boxes
         mut_box = pygame.Rect(0, HUD_Y, 180, HUD_H)
         inf_box = pygame.Rect(180, HUD_Y, 240, HUD_H)
@@ -528,35 +617,65 @@ def run_map_test(disease_file_path):
 
         pygame.draw.rect(screen, (0, 0, 0), region_progress_box, 2)
 
-        screen.blit(font.render("Mutations", True, (255, 255, 255)), (mut_box.x + 10, mut_box.y + 10))
-        screen.blit(font.render("Infections", True, (255, 255, 255)), (inf_box.x + 10, inf_box.y + 10))
-        screen.blit(font.render(f"{display_infected:,}", True, (255, 255, 255)), (inf_box.x + 10, inf_box.y + 40))
-        screen.blit(font.render("Region", True, (255, 255, 255)), (region_text_box.x + 10, region_text_box.y + 10))
-        screen.blit(font.render(display_region, True, (255, 255, 255)), (region_text_box.x + 10, region_text_box.y + 40))
+        white = (255, 255, 255)
+        screen.blit(text_cache.render(font, "Mutations", white), (mut_box.x + 10, mut_box.y + 10))
+        screen.blit(text_cache.render(font, "Infections", white), (inf_box.x + 10, inf_box.y + 10))
+        screen.blit(text_cache.render(font, f"{display_infected:,}", white), (inf_box.x + 10, inf_box.y + 40))
+        screen.blit(text_cache.render(font, "Region", white), (region_text_box.x + 10, region_text_box.y + 10))
+        screen.blit(text_cache.render(font, display_region, white), (region_text_box.x + 10, region_text_box.y + 40))
         # Difficulty label (top-right of the Region box)
         diff_colours = {"EASY": (0, 220, 0), "MEDIUM": (255, 165, 0), "HARD": (220, 0, 0)}
         if difficulty_label:
-            diff_surf = font.render(difficulty_label, True, diff_colours.get(difficulty_label, (255, 255, 255)))
+            diff_surf = text_cache.render(font, difficulty_label, diff_colours.get(difficulty_label, white))
             screen.blit(diff_surf, (region_text_box.right - diff_surf.get_width() - 10, region_text_box.y + 10))
 
-        screen.blit(font.render("Population", True, (255, 255, 255)), (pop_box.x + 10, pop_box.y + 10))
-        screen.blit(font.render(f"{display_population:,}", True, (255, 255, 255)), (pop_box.x + 10, pop_box.y + 40))
+        screen.blit(text_cache.render(font, "Population", white), (pop_box.x + 10, pop_box.y + 10))
+        screen.blit(text_cache.render(font, f"{display_population:,}", white), (pop_box.x + 10, pop_box.y + 40))
 
-        screen.blit(font.render("Deaths", True, (255, 255, 255)), (death_box.x + 10, death_box.y + 10))
-        screen.blit(font.render(f"{display_dead:,}", True, (255, 255, 255)), (death_box.x + 10, death_box.y + 40))
-        screen.blit(font.render("Cure", True, (255, 255, 255)), (cure_box.x + 10, cure_box.y + 10))
+        screen.blit(text_cache.render(font, "Deaths", white), (death_box.x + 10, death_box.y + 10))
+        screen.blit(text_cache.render(font, f"{display_dead:,}", white), (death_box.x + 10, death_box.y + 40))
+        screen.blit(text_cache.render(font, "Cure", white), (cure_box.x + 10, cure_box.y + 10))
 
     running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
-
-        running = handle_events()
-        update_simulation(dt)
-
-        display_region, display_infected, display_dead, display_population = resolve_display_stats()
-        draw_frame(display_region, display_infected, display_dead, display_population)
+    # A worker error is re-raised by sim_worker.latest() / stop(); the finally blocks make
+    # sure a crashed run still stops the worker and saves its history and disease file.
+    try:
+        while running:
+            clock.tick(60)
+            mark = profiler.now() if profiler is not None else 0
+
+            running = handle_events()
+            if profiler is not None:
+                mark = profiler.lap("frame.events", mark)
+
+            snapshot = sim_worker.latest()
+            display_region, display_infected, display_dead, display_population = resolve_display_stats(snapshot)
+            dirty_rects = draw_frame(snapshot, display_region, display_infected, display_dead, display_population, mark)
+
+            # Only push the parts of the screen that changed this frame.
+            if profiler is not None:
+                with profiler.phase("frame.flip"):
+                    pygame.display.update(dirty_rects)
+            else:
+                pygame.display.update(dirty_rects)
+    finally:
+        # The worker must be stopped (stop() joins it) before the history it writes to is closed.
+        try:
+            sim_worker.stop()
+        finally:
+            if profiler is not None:
+                profiler.dump_json(
+                    os.path.splitext(disease_file_path)[0] + "_profile.json",
+                    extra={"dropped_ticks": sim_worker.dropped_ticks, "collapsed_days": sim_worker.collapsed_days},
+                )
 
-        pygame.display.flip()
+            # Save post-game history: the samples stay in their column files; the disease JSON
+            # only records where they are, so it never grows with game length.
+            history.close()
+            disease_data["history"] = {"dir": history_dir, "rows": history.rows_written}
+            disease_data["wiped_out_order"] = history.wiped_out_order
+            with open(disease_file_path, "w") as f:
+                json.dump(disease_data, f, indent=4)
 
     return
 
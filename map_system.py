@@ -1,21 +1,26 @@
 import os
-import random
+
+import numpy as np
 import pygame
 
+from assets import AssetManager
+from lru import LRUCache
+# The simulation core lives in simulation.py so it can be imported without pygame.
+# It is re-exported here so existing "from map_system import ..." callers keep working.
+from simulation import Region, Simulation, build_regions_from_config, region_status_colour
+
 # -----------------------------------------------------------------------------
 # World data import (single source of truth)
 # -----------------------------------------------------------------------------
-# REGION_CONFIG + LAND_CONNECTIONS belong in region_data.py because they are
-# “content/balancing data”, not algorithms. This keeps your simulation code stable
-# even if you rebalance populations or borders later.
+# The renderer only needs the ID-map colours; region balancing data is read by simulation.py.
 
 # The try statement is used to attempt operations that may fail and to handle predictable
 # errors gracefully, preventing the program from crashing while providing meaningful feedback.
 try:
-    from region_data import REGION_CONFIG, LAND_CONNECTIONS, REGION_ID_HEX
+    from region_data import REGION_ID_HEX
 except ImportError as e:
     raise ImportError(
-        "Could not import REGION_CONFIG / LAND_CONNECTIONS from region_data.py. "
+        "Could not import REGION_ID_HEX from region_data.py. "
         "Ensure region_data.py is in the same folder as main.py and map_system.py."
     ) from e
 
@@ -31,6 +36,54 @@ def hex_to_rgba(hex_rgba: str):
     return (r, g, b, a)
 
 
+# Hard-coded default land green:
+# This matches your exported base map land colour so regions don’t flicker
+# if the simulation hasn’t assigned a colour yet.
+DEFAULT_LAND_RGBA = (68, 111, 0, 255)
+
+
+class TintCache(LRUCache):
+    """
+    Bounded LRU cache of tinted region overlays.
+
+    region_status_colour() is a continuous gradient, so an unbounded (region, rgba)
+    cache grows by one surface for nearly every frame of a long game. Colours are
+    snapped to `colour_steps` evenly spaced levels per channel before lookup (the
+    endpoints 0 and 255 are always exact), and the least recently used surface is
+    dropped once `max_entries` is reached.
+
+    hits / misses / evictions are kept for profiling (see lru.LRUCache).
+    """
+
+    def __init__(self, max_entries: int = 256, colour_steps: int = 32):
+        if colour_steps < 2 or colour_steps > 256:
+            raise ValueError(f"colour_steps must be between 2 and 256, got {colour_steps}")
+        super().__init__(max_entries)
+
+        self.colour_steps = colour_steps
+
+        # Precomputed channel -> level table (256 entries, cheap to index per frame).
+        levels = colour_steps - 1
+        self._levels = tuple(round(round(c * levels / 255) * 255 / levels) for c in range(256))
+        self._levels_array = np.array(self._levels, dtype=np.uint8)
+
+    def quantize(self, rgba: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        levels = self._levels
+        r, g, b, a = rgba
+        return (levels[r], levels[g], levels[b], levels[a])
+
+    def quantize_array(self, colours: np.ndarray) -> np.ndarray:
+        """quantize() for a whole (n, 4) uint8 colour array at once."""
+        return self._levels_array[colours]
+
+    def get(self, region: str, rgba: tuple[int, int, int, int], make_overlay):
+        """Return the overlay for (region, rgba); make_overlay(rgba) builds it on a miss.
+
+        rgba must already be quantized (see quantize()).
+        """
+        return self.get_or_build((region, rgba), make_overlay, rgba)
+
+
 class MapRenderer:
     """
     Draws the world map.
@@ -39,71 +92,206 @@ class MapRenderer:
     - base map image
     - per-region mask overlays tinted to colours you provide
 
+    Two ways to draw:
+    - draw(): full redraw every call (base + one blit per region)
+    - draw_dirty(): keeps a composed copy of the map and only re-composites the
+      bounding rects of regions whose colour changed; returns the dirty rects so the
+      caller can use pygame.display.update(rects) instead of flip()
+
+    Two render modes:
+    - "masks": one tinted mask overlay per region (soft mask edges)
+    - "palette": map_id.png is decoded once into an 8-bit surface holding a region
+      index per pixel (0 = no region, region k -> k + 1). Recolouring a region only
+      rewrites its palette entry and every frame is a single blit, however many
+      regions there are. No mask files are loaded in this mode.
+
     It does NOT run disease logic. That stays in Simulation.
     """
 
+    RENDER_MODES = ("masks", "palette")
+
     def __init__(
         self,
         assets_dir: str,
         map_size: tuple[int, int],
         region_names: list[str],
+        tint_cache_entries: int = 256,
+        colour_steps: int = 32,
+        render_mode: str = "masks",
+        assets: AssetManager | None = None,
+        id_colours: dict[str, str] | None = None,
     ):
+        if render_mode not in self.RENDER_MODES:
+            raise ValueError(f"Unknown render mode '{render_mode}' (expected one of {', '.join(self.RENDER_MODES)})")
+
         self.assets_dir = assets_dir
         self.map_size = map_size
+        self.render_mode = render_mode
+
+        # Shared loader/cache; pass the game's AssetManager so reopening the map is free.
+        self.assets = assets if assets is not None else AssetManager()
 
         self.maps_dir = os.path.join(self.assets_dir, "maps")
         self.masks_dir = os.path.join(self.maps_dir, "masks")
 
+        self.region_names = region_names
+
+        # Region -> "rrggbbaa" colour in map_id.png (REGION_ID_HEX unless a generated
+        # world supplies its own).
+        self.id_colours = id_colours if id_colours is not None else REGION_ID_HEX
+
+        # Masks define each region’s shape (white on transparent).
+        # File naming is hard-coded by convention: <region>_mask.png
+        mask_paths = []
+        if self.render_mode == "masks":
+            for region in self.region_names:
+                mask_path = os.path.join(self.masks_dir, f"{region}_mask.png")
+                if not os.path.exists(mask_path):
+                    raise FileNotFoundError(
+                        f"Missing mask for region '{region}': {mask_path}\n"
+                        f"Expected filename: {region}_mask.png"
+                    )
+                mask_paths.append(mask_path)
+
         # Base map is static (ocean + default land look). Drawn first each frame.
-        self.base_map = self._load_image(os.path.join(self.maps_dir, "map_base.png"))
+        # It is decoded in the same parallel batch as the masks.
+        self.base_map, *full_masks = self.assets.load_many(
+            [os.path.join(self.maps_dir, "map_base.png"), *mask_paths], self.map_size
+        )
 
         # ID map is a colour-coded reference image used for click detection.
         # It is never displayed to the player.
         #
         # Requirement:
         # - assets/maps/map_id.png must be the same size as map_base.png
-        self.id_map = self._load_image(os.path.join(self.maps_dir, "map_id.png"))
-
-        # Reverse lookup: (r, g, b) -> region key
+        #
+        # It is decoded once into id_array[x, y]: 0 = no region, region k -> k + 1.
         # Alpha is ignored because some exports can introduce minor alpha variation.
-        self._id_lookup = {}
-        for region_key, hex_rgba in REGION_ID_HEX.items():
-            r, g, b, _a = hex_to_rgba(hex_rgba)
-            self._id_lookup[(r, g, b)] = region_key
+        self.id_array = self._decode_id_map(os.path.join(self.maps_dir, "map_id.png"))
 
-        # Masks define each region’s shape (white on transparent).
-        # File naming is hard-coded by convention: <region>_mask.png
-        self.region_names = region_names
+        # Per-region pixel counts and centroids (label / tooltip anchors).
+        self.region_pixel_counts: dict[str, int] = {}
+        self.region_centroids: dict[str, tuple[float, float] | None] = {}
+        self._measure_regions()
+
+        # Each mask is trimmed to its non-transparent bounding rect at load time, so
+        # masks, tinted copies and blits only cover the region's own area.
+        # region_rects keeps where each trimmed mask sits on the map.
         self.region_masks: dict[str, pygame.Surface] = {}
+        self.region_rects: dict[str, pygame.Rect] = {}
 
-        for region in self.region_names:
-            mask_path = os.path.join(self.masks_dir, f"{region}_mask.png")
-            if not os.path.exists(mask_path):
-                raise FileNotFoundError(
-                    f"Missing mask for region '{region}': {mask_path}\n"
-                    f"Expected filename: {region}_mask.png"
-                )
-            self.region_masks[region] = self._load_image(mask_path)
+        # Palette mode state (None in masks mode).
+        self._index_surface: pygame.Surface | None = None
+        self._palette_colours: dict[str, tuple[int, int, int]] = {}
 
-        # Tint cache avoids re-tinting surfaces every frame (performance).
-        self._tint_cache: dict[tuple[str, tuple[int, int, int, int]], pygame.Surface] = {}
+        if self.render_mode == "palette":
+            self._build_index_surface()
+        else:
+            for region, full_mask in zip(self.region_names, full_masks):
+                rect = self._alpha_bounding_rect(full_mask)
+                self.region_masks[region] = full_mask.subsurface(rect).copy()
+                self.region_rects[region] = rect
 
-    def draw(
-        self,
-        screen: pygame.Surface,
-        region_colours: dict[str, tuple[int, int, int, int]],
-    ):
+        # Tint cache avoids re-tinting surfaces every frame (performance).
+        # It is bounded and quantizes colours, so memory stays flat over long games.
+        self._tint_cache = TintCache(max_entries=tint_cache_entries, colour_steps=colour_steps)
+
+        # draw_dirty() state: the fully composed map and the colour each region had when
+        # it was last composited. None means "compose everything on the next call".
+        self._composed: pygame.Surface | None = None
+        self._composed_colours: np.ndarray | None = None
+
+    def draw(self, screen: pygame.Surface, region_colours):
+        """
+        Full redraw. region_colours is either a dict of region -> RGBA or an (n, 4)
+        uint8 array with one row per region in region_names order (e.g. the
+        simulation's colour buffer, as published in SimSnapshot.colours).
+        """
         # Draw base first.
         screen.blit(self.base_map, (0, 0))
 
+        colours = self._quantized_colours(region_colours)
+
+        if self.render_mode == "palette":
+            self._apply_palette(colours)
+            screen.blit(self._index_surface, (0, 0))
+            return
+
         # Then overlay tinted masks.
-        for region in self.region_names:
-            # Hard-coded default land green:
-            # This matches your exported base map land colour so regions don’t flicker
-            # if the simulation hasn’t assigned a colour yet.
-            rgba = region_colours.get(region, (68, 111, 0, 255))
-            overlay = self._get_tinted_overlay(region, rgba)
-            screen.blit(overlay, (0, 0))
+        for region, rgba in zip(self.region_names, colours.tolist()):
+            overlay = self._get_tinted_overlay(region, tuple(rgba))
+            screen.blit(overlay, self.region_rects[region].topleft)
+
+    def draw_dirty(self, screen: pygame.Surface, region_colours) -> list[pygame.Rect]:
+        """
+        Bring the map on `screen` up to date and return the rects that changed.
+
+        region_colours is a dict or an (n, 4) array, as for draw(). The first call (or
+        the first after invalidate()) composes the whole map and returns the full map
+        rect. Later calls only touch regions whose colour changed (after quantization,
+        so tiny gradient moves do not re-composite anything).
+        """
+        colours = self._quantized_colours(region_colours)
+
+        if self.render_mode == "palette":
+            self._apply_palette(colours)
+
+        if self._composed is None:
+            self._composed = pygame.Surface(self.map_size).convert()
+            self._recompose_area(self._composed.get_rect(), colours)
+            self._composed_colours = colours
+            screen.blit(self._composed, (0, 0))
+            return [self._composed.get_rect()]
+
+        # One array comparison finds the regions whose quantized colour moved.
+        changed = np.flatnonzero((colours != self._composed_colours).any(axis=1)).tolist()
+        names = self.region_names
+        dirty = [self.region_rects[names[k]] for k in changed if self.region_rects[names[k]].width > 0]
+        self._composed_colours = colours
+
+        for rect in dirty:
+            self._recompose_area(rect, colours)
+            screen.blit(self._composed, rect.topleft, rect)
+        return dirty
+
+    def restore(self, screen: pygame.Surface, rect: pygame.Rect):
+        """Copy the composed map back over `rect` (erases HUD text/prompts drawn on top last frame)."""
+        if self._composed is not None:
+            screen.blit(self._composed, rect.topleft, rect)
+
+    def invalidate(self):
+        """Force draw_dirty() to recompose the whole map on its next call."""
+        self._composed = None
+
+    def _quantized_colours(self, region_colours) -> np.ndarray:
+        # (n, 4) uint8 rows in region_names order. A dict gives every region a colour
+        # (default land if unset). Snapped to the tint cache's levels in both render
+        # modes so draw() and draw_dirty() always agree; the result is a new array, so
+        # a caller's buffer is never kept or modified.
+        if isinstance(region_colours, dict):
+            region_colours = [region_colours.get(region, DEFAULT_LAND_RGBA) for region in self.region_names]
+        colours = np.asarray(region_colours, dtype=np.uint8)
+        if colours.shape != (len(self.region_names), 4):
+            raise ValueError(f"Expected {len(self.region_names)} RGBA rows, got an array of shape {colours.shape}")
+        return self._tint_cache.quantize_array(colours)
+
+    def _recompose_area(self, rect: pygame.Rect, colours: np.ndarray):
+        # Rebuild one area in the same order draw() uses: base first, then every overlay
+        # that overlaps it (neighbouring regions can share the rect).
+        self._composed.blit(self.base_map, rect.topleft, rect)
+
+        if self.render_mode == "palette":
+            # Palette entries are already up to date; index 0 is the colour key.
+            self._composed.blit(self._index_surface, rect.topleft, rect)
+            return
+
+        for k, region in enumerate(self.region_names):
+            region_rect = self.region_rects[region]
+            overlap = region_rect.clip(rect)
+            if overlap.width > 0 and overlap.height > 0:
+                overlay = self._get_tinted_overlay(region, tuple(colours[k].tolist()))
+                # The overlay is cropped, so the source area is relative to its own origin.
+                self._composed.blit(overlay, overlap.topleft, overlap.move(-region_rect.x, -region_rect.y))
 
     def get_region_at(self, screen_pos: tuple[int, int]):
         """Return the region key at screen_pos using the ID map; None if ocean/unknown."""
@@ -114,395 +302,136 @@ class MapRenderer:
         if x < 0 or y < 0 or x >= self.map_size[0] or y >= self.map_size[1]:
             return None
 
-        r, g, b, _a = self.id_map.get_at((x, y))
-        return self._id_lookup.get((r, g, b))
-
-    def _load_image(self, path: str):
-        image = pygame.image.load(path).convert_alpha()
-        if image.get_size() != self.map_size:
-            image = pygame.transform.smoothscale(image, self.map_size)
-        return image
-
-    def _get_tinted_overlay(self, region: str, rgba: tuple[int, int, int, int]):
-        key = (region, rgba)
-        if key in self._tint_cache:
-            return self._tint_cache[key]
-
-        tinted = self.region_masks[region].copy()
-        tinted.fill(rgba, special_flags=pygame.BLEND_RGBA_MULT)
-        self._tint_cache[key] = tinted
-        return tinted
-
-
-class Region:
-    def __init__(
-        self,
-        name: str,
-        population: int,
-        healthcare_score: float,
-        airports_open: bool = True,
-    ):
-        self.name = name
-        self.population = int(population)
-
-        # Compartments are floats internally so small per-tick changes do not get lost to int() rounding.
-        # The HUD can still render int(...) values for readability.
-        self.susceptible = float(population)
-        self.exposed = 0.0
-        self.infected = 0.0
-        self.recovered = 0.0
-        self.dead = 0.0
-
-
-        # Healthcare score 0..1 (higher = stronger system). Used later for resistance/cure.
-        self.healthcare_score = max(0.0, min(1.0, float(healthcare_score)))
-
-        # Airport flag used later for air travel spread.
-        self.airports_open = bool(airports_open)
-
-        # Visual colour is derived by Simulation.
-        self.colour_rgba = (68, 111, 0, 255)
-
-    def visual_severity_ratio(self):
-        if self.population <= 0:
-            return 0.0
-
-        infected_ratio = self.infected / self.population
-        dead_ratio = self.dead / self.population
-
-        # Infections give early visual feedback; deaths dominate late-game severity.
-        # Scaling infected_ratio avoids the map looking "stuck green" when infected is still a small share.
-        v = (0.2 * min(1.0, infected_ratio * 3.0)) + (0.8 * (dead_ratio ** 3))
-
-        if dead_ratio >= 0.96:
-            t = (dead_ratio - 0.96) / 0.04  # 0 at 96% dead, 1 at 100% dead
-            if t < 0.0:
-                t = 0.0
-            if t > 1.0:
-                t = 1.0
-            v = (v * (1.0 - t)) + (1.0 * t)
-
-        if v < 0.0:
-            v = 0.0
-        if v > 1.0:
-            v = 1.0
-
-        return v
-
-    def set_airports_open(self, is_open: bool):
-        self.airports_open = bool(is_open)
-
-
-def region_status_colour(ratio: float):
-    """Map a 0..1 severity ratio to a clear game-style gradient.
-
-    Intent:
-    - Most of the game stays in green/yellow/red.
-    - Dark red is reached at ~80%.
-    - After 80%, fade into grey to signal a region is effectively dead.
-
-    This is deliberately simple to tune.
-    """
-
-    # Clamp
-    if ratio < 0.0:
-        ratio = 0.0
-    if ratio > 1.0:
-        ratio = 1.0
-
-    def lerp(a: int, b: int, t: float) -> int:
-        return int(a + (b - a) * t)
-
-    # Key colours (RGBA)
-    green = (0, 120, 0, 255)
-    yellow = (255, 210, 0, 255)
-    red = (220, 0, 0, 255)
-    dark_red = (120, 0, 0, 255)
-    death_grey = (40, 40, 40, 255)
-
-    # Front-loaded thresholds (earlier visual feedback):
-    # 0.00 -> 0.12 : green -> yellow
-    if ratio < 0.12:
-        t = ratio / 0.12
-        return (
-            lerp(green[0], yellow[0], t),
-            lerp(green[1], yellow[1], t),
-            lerp(green[2], yellow[2], t),
-            255,
-        )
-
-    # 0.12 -> 0.40 : yellow -> red
-    if ratio < 0.40:
-        t = (ratio - 0.12) / 0.28
-        return (
-            lerp(yellow[0], red[0], t),
-            lerp(yellow[1], red[1], t),
-            lerp(yellow[2], red[2], t),
-            255,
-        )
-
-    # 0.40 -> 0.70 : red -> dark red
-    if ratio < 0.70:
-        t = (ratio - 0.40) / 0.30
-        return (
-            lerp(red[0], dark_red[0], t),
-            lerp(red[1], dark_red[1], t),
-            lerp(red[2], dark_red[2], t),
-            255,
-        )
-
-    # 0.70 -> 1.00 : dark red -> death grey
-    t = (ratio - 0.70) / 0.30
-    return (
-        lerp(dark_red[0], death_grey[0], t),
-        lerp(dark_red[1], death_grey[1], t),
-        lerp(dark_red[2], death_grey[2], t),
-        255,
-    )
-
-
-class Simulation:
-    """
-    Simulation scaffold.
-
-    What it does now:
-    - tracks time as ticks
-    - keeps region colours consistent with current visual severity (infections + weighted deaths)
-    - advances per-region SEIRD state once per in-game day (update_one_day)
-
-    What it does NOT do yet:
-    - no air travel spread yet
-    - no cure effort system yet
-    """
-
-    def __init__(self, regions: dict[str, Region]):
-        self.regions = regions
-        self.sim_time_ticks = 0
-
-        # These counters let the same update method support either:
-        # - daily updates (called once per day)
-        # - smooth updates (called multiple times per day)
-        self.day_count = 0
-        self._tick_in_day = 0
-        self._assumed_ticks_per_day = 20
-
-        # Export cooldown (region -> last day it successfully exported).
-        self.last_export_day: dict[str, int] = {}
+        idx = int(self.id_array[x, y])
+        return self.region_names[idx - 1] if idx else None
+
+    def regions_at(self, points) -> list:
+        """
+        Vectorized get_region_at for many (x, y) points at once (e.g. hover trails).
+
+        Returns one region key (or None) per point, in order.
+        """
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        inside = (xs >= 0) & (ys >= 0) & (xs < self.map_size[0]) & (ys < self.map_size[1])
+
+        indices = np.zeros(len(points), dtype=np.int64)
+        indices[inside] = self.id_array[xs[inside], ys[inside]]
+
+        lookup = [None, *self.region_names]
+        return [lookup[idx] for idx in indices.tolist()]
+
+    def _load_image(self, path: str, smooth: bool = True):
+        # Smooth scaling would blend ID colours at borders, so ID data uses nearest.
+        return self.assets.load(path, self.map_size, smooth=smooth)
+
+    @staticmethod
+    def _alpha_bounding_rect(surface: pygame.Surface) -> pygame.Rect:
+        # Same result as surface.get_bounding_rect(), but ~4x faster on full-map masks.
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        xs = np.flatnonzero(alpha.any(axis=1))
+        ys = np.flatnonzero(alpha.any(axis=0))
+        del alpha  # releases the surface lock
+
+        if xs.size == 0:
+            return pygame.Rect(0, 0, 0, 0)
+        return pygame.Rect(int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1))
+
+    def _decode_id_map(self, path: str):
+        """Decode the ID map into a region-index array (uint8, or uint16 past 255 regions)."""
+        # Nearest scaling only: blended border colours would match no region.
+        id_image = self._load_image(path, smooth=False)
+        rgb = pygame.surfarray.array3d(id_image).astype(np.int32)
+        packed = (rgb[:, :, 0] << 16) | (rgb[:, :, 1] << 8) | rgb[:, :, 2]
+
+        dtype = np.uint8 if len(self.region_names) <= 255 else np.uint16
+
+        # Regions without an ID colour are simply never hit (they can't be clicked).
+        keys = []
+        for k, region in enumerate(self.region_names):
+            if region in self.id_colours:
+                r, g, b, _a = hex_to_rgba(self.id_colours[region])
+                keys.append(((r << 16) | (g << 8) | b, k + 1))
+        if not keys:
+            return np.zeros(self.map_size, dtype=dtype)
+
+        # Sorted ID colours -> region index; pixels with no exact match stay 0.
+        keys.sort()
+        colours = np.array([key for key, _idx in keys], dtype=np.int32)
+        values = np.array([idx for _key, idx in keys], dtype=dtype)
+
+        pos = np.clip(np.searchsorted(colours, packed), 0, len(colours) - 1)
+        return np.where(colours[pos] == packed, values[pos], 0).astype(dtype)
+
+    def _measure_regions(self):
+        count = len(self.region_names) + 1
+        flat = self.id_array.ravel().astype(np.int64)
+
+        # id_array is indexed [x, y], so the flat index is x * height + y.
+        height = self.id_array.shape[1]
+        positions = np.arange(flat.size, dtype=np.int64)
+        pixels = np.bincount(flat, minlength=count)
+        sum_x = np.bincount(flat, weights=positions // height, minlength=count)
+        sum_y = np.bincount(flat, weights=positions % height, minlength=count)
+
+        for k, region in enumerate(self.region_names, start=1):
+            n = int(pixels[k])
+            self.region_pixel_counts[region] = n
+            self.region_centroids[region] = (float(sum_x[k] / n), float(sum_y[k] / n)) if n else None
+
+    def _build_index_surface(self):
+        """Build the 8-bit palette surface from id_array (palette mode)."""
+        if len(self.region_names) > 255:
+            raise ValueError(f"Palette rendering supports at most 255 regions, got {len(self.region_names)}")
+
+        missing = [region for region in self.region_names if region not in self.id_colours]
+        if missing:
+            raise ValueError(f"No ID colour for: {', '.join(missing)}")
+
+        indices = self.id_array
+
+        surface = pygame.Surface(self.map_size, depth=8)
+        surface.set_palette([(0, 0, 0)] * 256)
+        pygame.surfarray.blit_array(surface, indices)
+        surface.set_colorkey(0)
+        self._index_surface = surface
+
+        # Bounding rect of each region's pixels (for dirty rects).
+        xs, ys = np.nonzero(indices)
+        ids = indices[xs, ys].astype(np.int64)
+        count = len(self.region_names) + 1
+        min_x = np.full(count, self.map_size[0], dtype=np.int64)
+        min_y = np.full(count, self.map_size[1], dtype=np.int64)
+        max_x = np.full(count, -1, dtype=np.int64)
+        max_y = np.full(count, -1, dtype=np.int64)
+        np.minimum.at(min_x, ids, xs)
+        np.minimum.at(min_y, ids, ys)
+        np.maximum.at(max_x, ids, xs)
+        np.maximum.at(max_y, ids, ys)
+
+        for k, region in enumerate(self.region_names, start=1):
+            if max_x[k] < 0:
+                self.region_rects[region] = pygame.Rect(0, 0, 0, 0)
+            else:
+                self.region_rects[region] = pygame.Rect(
+                    int(min_x[k]), int(min_y[k]), int(max_x[k] - min_x[k] + 1), int(max_y[k] - min_y[k] + 1)
+                )
 
-    def land_neighbours(self, region_name: str) -> list[str]:
-        # Kept ready for later land spread.
-        return LAND_CONNECTIONS.get(region_name, [])
+    def _apply_palette(self, region_colours: np.ndarray):
+        # Only touch palette entries whose colour actually changed.
+        for k, (region, (r, g, b, _a)) in enumerate(zip(self.region_names, region_colours.tolist()), start=1):
+            rgb = (r, g, b)
+            if self._palette_colours.get(region) != rgb:
+                self._index_surface.set_palette_at(k, rgb)
+                self._palette_colours[region] = rgb
 
-    def update_one_tick(self):
-        self.sim_time_ticks += 1
+    def tint_cache_stats(self) -> dict:
+        return self._tint_cache.stats()
 
-    def update_one_day(
-        self,
-        infectivity_rate,
-        severity_rate,
-        lethality_rate,
-        incubation_days,
-        immunity_decay_rate=0.01,
-        min_pressure=0.03,
-        export_base_chance=0.04,
-        export_cooldown_days=8,
-        export_seed_base=25,
-    ):
-        if incubation_days <= 0:
-            incubation_days = 1
-
-        # Auto-detect whether the caller is passing per-tick rates (small) or per-day rates (large).
-        # If you divide your rates in main.py to get smoother motion, this keeps behaviour consistent.
-        # Detect smoothing mode based on infectivity/severity only.
-        # Lethality is a fraction of resolving cases, so it should NOT affect tick/day detection.
-        per_tick_mode = (infectivity_rate < 0.5 and severity_rate < 0.5)
-
-        ticks_per_day = self._assumed_ticks_per_day if per_tick_mode else 1
-        day_fraction = 1.0 / ticks_per_day
-
-        # Advance time. Only bump day_count when a full day has elapsed.
-        if per_tick_mode:
-            self._tick_in_day += 1
-            if self._tick_in_day >= ticks_per_day:
-                self._tick_in_day = 0
-                self.day_count += 1
-        else:
-            self.day_count += 1
-
-        day_boundary = (not per_tick_mode) or (self._tick_in_day == 0)
-
-        # Global activity check: keeps the disease “alive” while there are still cases anywhere.
-        # This prevents the simulation stalling because pressure collapses to ~0 late-game.
-        global_active = 0.0
-        for rgn in self.regions.values():
-            global_active += (rgn.exposed + rgn.infected)
-        disease_exists = global_active > 0.0
-
-        for region in self.regions.values():
-            pop = region.population
-            if pop <= 0:
-                continue
-
-            s = region.susceptible
-            e = region.exposed
-            i = region.infected
-            r = region.recovered
-
-            # Mild healthcare effect (kept intentionally small for now; easy to tune later).
-            spread_scale = 1.0 - (0.25 * region.healthcare_score)
-            death_scale = 1.0 - (0.25 * region.healthcare_score)
-            eff_infectivity = infectivity_rate * spread_scale
-            eff_lethality = lethality_rate * death_scale
-
-            pressure = 0.0
-            if pop > 0:
-                pressure = i / pop
-
-            # Persistence floor (eradication still possible):
-            # - Only applies while disease exists somewhere globally.
-            # - Only applies to regions that already have local cases (E or I), so it does not
-            #   “spawn” infection in clean regions.
-            if disease_exists and (i > 0.0 or e > 0.0) and pressure < min_pressure:
-                pressure = min_pressure
-
-            # S -> E
-            new_e = s * eff_infectivity * pressure
-            if new_e > s:
-                new_e = s
-            if new_e < 0.0:
-                new_e = 0.0
-
-            # E -> I (incubation)
-            new_i = e / (incubation_days * ticks_per_day)
-            if new_i > e:
-                new_i = e
-            if new_i < 0.0:
-                new_i = 0.0
-
-            # I -> resolved (R or D)
-            resolving = i * severity_rate
-            if resolving > i:
-                resolving = i
-            if resolving < 0.0:
-                resolving = 0.0
-
-            # resolved -> deaths
-            new_d = resolving * eff_lethality
-            if new_d > resolving:
-                new_d = resolving
-            if new_d < 0.0:
-                new_d = 0.0
-
-            new_r = resolving - new_d
-
-            # Immunity decay (R -> S). Default is 0.01 unless overridden by caller.
-            # Treat immunity_decay_rate as "per day" and scale it down when updating multiple times per day.
-            lost_immunity = r * (immunity_decay_rate * day_fraction)
-            if lost_immunity > r:
-                lost_immunity = r
-            if lost_immunity < 0.0:
-                lost_immunity = 0.0
-
-            region.susceptible = (s - new_e) + lost_immunity
-            region.exposed = e + new_e - new_i
-            region.infected = i + new_i - resolving
-
-
-            region.recovered = (r + new_r) - lost_immunity
-            region.dead += new_d
-
-            # Guard against tiny negative drift from float ops.
-            if region.susceptible < 0.0:
-                region.susceptible = 0.0
-            if region.exposed < 0.0:
-                region.exposed = 0.0
-            if region.infected < 0.0:
-                region.infected = 0.0
-            if region.recovered < 0.0:
-                region.recovered = 0.0
-
-        # Land transmission (event-based): occasional export attempts that seed Exposed.
-        # Run exports once per simulated day, even if disease dynamics are updated multiple times per day.
-        if day_boundary:
-            for src_name, src in self.regions.items():
-                # Allow exports during incubation so spread doesn't feel "stuck".
-                if (src.exposed + src.infected) <= 0.0:
-                    continue
-
-                neighbours = self.land_neighbours(src_name)
-                if not neighbours:
-                    continue
-
-                last = self.last_export_day.get(src_name, -10_000)
-                if (self.day_count - last) < export_cooldown_days:
-                    continue
-
-                # Threshold-triggered exports (Plague Inc pacing):
-                # A region only starts exporting once it has a meaningful outbreak.
-                active = (src.exposed + src.infected)
-
-                # Daily-scale infectivity keeps exports consistent when main.py smooths rates.
-                daily_infectivity = infectivity_rate * ticks_per_day
-
-                # Base chance is set by outbreak size; infectivity then scales it.
-                # Bands are tuned for gradual "country-by-country" spread.
-                if active < 2000.0:
-                    continue
-                elif active < 20000.0:
-                    base = 0.01
-                elif active < 100000.0:
-                    base = 0.03
-                else:
-                    base = 0.06
-
-                chance = base * daily_infectivity
-                if chance > 0.18:
-                    chance = 0.18
-
-                if random.random() >= chance:
-                    continue
-
-                dst_name = random.choice(neighbours)
-                dst = self.regions.get(dst_name)
-                if dst is None or dst.susceptible <= 0.0:
-                    continue
-
-                # Seed a small Exposed foothold so the neighbour ramps up after incubation.
-                seed = export_seed_base * daily_infectivity
-                if seed < 1.0:
-                    seed = 1.0
-                if seed > 250.0:
-                    seed = 250.0
-
-                if seed > dst.susceptible:
-                    seed = dst.susceptible
-
-                dst.susceptible -= seed
-                dst.exposed += seed
-
-                if dst.susceptible < 0.0:
-                    dst.susceptible = 0.0
-
-                self.last_export_day[src_name] = self.day_count
-
-        for region in self.regions.values():
-            region.colour_rgba = region_status_colour(region.visual_severity_ratio())
-
-
-def build_regions_from_config() -> dict[str, Region]:
-    """
-    Builds Region objects using REGION_CONFIG.
+    def _get_tinted_overlay(self, region: str, rgba: tuple[int, int, int, int]):
+        def make_overlay(colour):
+            tinted = self.region_masks[region].copy()
+            tinted.fill(colour, special_flags=pygame.BLEND_RGBA_MULT)
+            return tinted
 
-    Hard requirement:
-    - REGION_CONFIG keys must match mask filenames
-      e.g. "china" -> assets/maps/masks/china_mask.png
-    """
-    regions: dict[str, Region] = {}
-    for name, cfg in REGION_CONFIG.items():
-        regions[name] = Region(
-            name=name,
-            population=cfg["population"],
-            healthcare_score=cfg["healthcare_score"],
-            airports_open=cfg["airports_open"],
-        )
-    return regions
\ No newline at end of file
+        return self._tint_cache.get(region, rgba, make_overlay)
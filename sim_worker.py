@@ -0,0 +1,293 @@
+"""
+sim_worker.py
+
+Runs a Simulation on its own thread so the render loop never waits on it.
+
+The worker owns the Simulation: only the worker thread calls into it. After
+each batch of ticks it publishes an immutable SimSnapshot by swapping a single reference
+(a double buffer: the renderer keeps drawing the previous snapshot until the
+next one is complete). The render loop calls latest() whenever it draws a frame,
+so frame rate and tick rate are independent and a slow frame never delays ticks.
+
+Anything that changes the simulation (seeding the outbreak, changing speed,
+stopping) is sent as a command through a queue and applied between ticks.
+
+Speed and catch-up:
+- set_speed(2) runs at twice ticks_per_second; set_speed(None) runs flat out.
+- Ticks run in batches, at most publish_hz batches per second, and one snapshot
+  is published per batch. At high speed the renderer skips intermediate ticks
+  rather than drawing every one.
+- A batch never runs more than max_ticks_per_batch paced ticks. Time owed beyond
+  that (after a stall, or a speed the machine can't sustain) is dropped, not
+  caught up later, so the worker cannot fall into a spiral of ever-longer batches.
+- If a step_day callable is given, a batch that starts on a day boundary and
+  owes a whole day runs step_day once instead of ticks_per_day single ticks.
+  Only pass one when the integrator makes that accurate (rk45 treats the call's
+  span as continuous time; the clamped Euler step does not).
+
+Usage:
+    worker = SimulationWorker(simulation, step=run_one_tick, ticks_per_second=10, ticks_per_day=20)
+    worker.start()
+    worker.seed("china", 1000)
+    worker.set_speed(8)
+    snapshot = worker.latest()     # every frame
+    worker.stop()
+"""
+
+import queue
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from simulation import GlobalTotals
+from vector_engine import S, E, I, R, D
+
+# Selectable game speeds: label -> multiplier of the base tick rate (None = as fast as possible).
+SPEEDS = {"1x": 1, "2x": 2, "8x": 8, "max": None}
+
+
+class SimSnapshot(NamedTuple):
+    """Read-only view of the simulation after a batch of ticks (safe to hold across frames)."""
+
+    tick_count: int
+    day_count: int
+    started: bool
+    region_index: MappingProxyType   # region key -> row in compartments
+    compartments: np.ndarray          # (n, 5) S/E/I/R/D copy, not writeable
+    colours: np.ndarray               # (n, 4) uint8 RGBA copy of RegionStore.colours, not writeable
+    totals: GlobalTotals              # world-wide totals kept by the Simulation
+
+    def region_totals(self, region: str) -> tuple[float, float, float]:
+        """(infected, dead, living) for one region."""
+        row = self.compartments[self.region_index[region]]
+        return row[I], row[D], row[S] + row[E] + row[I] + row[R]
+
+    def global_totals(self) -> tuple[float, float, float]:
+        """(infected, dead, living) for the whole world (no per-region pass)."""
+        return self.totals.infected, self.totals.dead, self.totals.living
+
+
+class SimulationWorker:
+    """Background thread that ticks a Simulation at a fixed rate and publishes snapshots."""
+
+    def __init__(
+        self,
+        simulation,
+        step: Callable,
+        ticks_per_second: float,
+        ticks_per_day: int,
+        history=None,
+        step_day: Callable | None = None,
+        max_ticks_per_batch: int = 64,
+        publish_hz: float = 60.0,
+    ):
+        if ticks_per_second <= 0:
+            raise ValueError(f"ticks_per_second must be positive, got {ticks_per_second}")
+        if max_ticks_per_batch <= 0:
+            raise ValueError(f"max_ticks_per_batch must be positive, got {max_ticks_per_batch}")
+
+        self.simulation = simulation
+        self.step = step
+        self.step_day = step_day
+        self.ticks_per_second = float(ticks_per_second)
+        self.ticks_per_day = int(ticks_per_day)
+        self.history = history
+        self.max_ticks_per_batch = int(max_ticks_per_batch)
+        self.batch_seconds = 1.0 / publish_hz
+
+        # Multiplier of ticks_per_second; None = unpaced ("max").
+        self.speed: float | None = 1
+
+        self.tick_count = 0
+        self.day_count = 0
+        self.started = False
+
+        # Ticks owed to the clock but not run yet (fractional carry between batches).
+        self._owed = 0.0
+        self._last_batch = 0.0
+
+        # Diagnostics: ticks dropped by the catch-up limit, days run as one step.
+        self.dropped_ticks = 0
+        self.collapsed_days = 0
+
+        # Exception raised on the worker thread, re-raised to the caller by latest()/stop().
+        self.error: BaseException | None = None
+
+        self._region_index = MappingProxyType(
+            {name: idx for idx, name in enumerate(self.simulation.region_names)}
+        )
+        self._commands: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+        # Published before the thread starts so the first frame always has something to draw.
+        self._latest = self._snapshot()
+
+    def start(self):
+        self._thread.start()
+
+    def latest(self) -> SimSnapshot:
+        """The most recently published snapshot (never blocks)."""
+        if self.error is not None:
+            raise RuntimeError("Simulation worker stopped with an error") from self.error
+        return self._latest
+
+    def seed(self, region_name: str, amount: float):
+        """Start the outbreak in region_name; ticking begins once this is applied."""
+        self._commands.put(("seed", region_name, amount))
+
+    def set_rate(self, ticks_per_second: float):
+        if ticks_per_second <= 0:
+            raise ValueError(f"ticks_per_second must be positive, got {ticks_per_second}")
+        self._commands.put(("rate", ticks_per_second))
+
+    def set_speed(self, speed: float | None):
+        """Multiplier of the base tick rate (see SPEEDS); None runs as fast as possible."""
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive or None, got {speed}")
+        self._commands.put(("speed", speed))
+
+    def stop(self, timeout: float | None = 5.0):
+        """Finish the current tick, stop the thread and wait for it."""
+        if self._thread.is_alive():
+            self._commands.put(("stop",))
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise RuntimeError("Simulation worker stopped with an error") from self.error
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            while True:
+                # Wait for the next batch, waking early if a command arrives. Before the
+                # outbreak starts there is nothing to tick, so just wait for commands.
+                try:
+                    command = self._commands.get(timeout=self._wait_time())
+                except queue.Empty:
+                    command = None
+
+                if command is not None:
+                    if not self._apply(command):
+                        return
+                    continue
+
+                if self._run_batch():
+                    self._latest = self._snapshot()
+
+                if self.speed is None:
+                    # Flat out: give the render thread a turn at the GIL between batches.
+                    time.sleep(0)
+        except BaseException as e:
+            self.error = e
+
+    def _wait_time(self) -> float | None:
+        if not self.started:
+            return None
+        if self.speed is None:
+            return 0.0
+
+        # Sleep until at least one tick is owed, but never wake more than publish_hz times a second.
+        rate = self.ticks_per_second * self.speed
+        until_next_tick = (1.0 - self._owed) / rate - (time.perf_counter() - self._last_batch)
+        return max(0.0, until_next_tick, self._last_batch + self.batch_seconds - time.perf_counter())
+
+    def _run_batch(self) -> bool:
+        """Run the ticks owed since the last batch (within the budget). Returns True if any ran."""
+        now = time.perf_counter()
+        elapsed = now - self._last_batch
+        self._last_batch = now
+
+        if self.speed is None:
+            # Unpaced: run until this batch's time slice is used up.
+            deadline = now + self.batch_seconds
+            ran = False
+            while time.perf_counter() < deadline:
+                self._advance(self.ticks_per_day)
+                ran = True
+            return ran
+
+        self._owed += elapsed * self.ticks_per_second * self.speed
+        due = int(self._owed)
+        self._owed -= due
+
+        # Catch-up limit: anything beyond the budget is dropped, not carried over.
+        if due > self.max_ticks_per_batch:
+            self.dropped_ticks += due - self.max_ticks_per_batch
+            due = self.max_ticks_per_batch
+            self._owed = 0.0
+
+        ran = due > 0
+        while due > 0:
+            due -= self._advance(due)
+        return ran
+
+    def _advance(self, limit: int) -> int:
+        """Run one tick, or one collapsed day if allowed and within `limit` ticks. Returns ticks run."""
+        on_day_boundary = self.tick_count % self.ticks_per_day == 0
+        if self.step_day is not None and on_day_boundary and limit >= self.ticks_per_day:
+            self.step_day(self.simulation)
+            self.tick_count += self.ticks_per_day
+            self.day_count += 1
+            self.collapsed_days += 1
+            if self.history is not None:
+                self.history.maybe_record(self.simulation)
+            return self.ticks_per_day
+
+        self._tick()
+        return 1
+
+    def _apply(self, command) -> bool:
+        kind = command[0]
+        if kind == "stop":
+            return False
+
+        if kind == "seed":
+            _kind, region_name, amount = command
+            self.simulation.seed_infection(region_name, amount)
+            if not self.started:
+                # The tick clock starts from the moment the outbreak is seeded.
+                self.started = True
+                self._owed = 0.0
+                self._last_batch = time.perf_counter()
+            if self.history is not None:
+                self.history.record(self.simulation)  # day 0 sample
+            self._latest = self._snapshot()
+        elif kind == "rate":
+            self.ticks_per_second = float(command[1])
+        elif kind == "speed":
+            self.speed = command[1]
+        else:
+            raise ValueError(f"Unknown simulation worker command: {kind}")
+        return True
+
+    def _tick(self):
+        self.step(self.simulation)
+        self.tick_count += 1
+        if self.tick_count % self.ticks_per_day == 0:
+            self.day_count += 1
+
+        if self.history is not None:
+            self.history.maybe_record(self.simulation)
+
+    def _snapshot(self) -> SimSnapshot:
+        compartments = np.array(self.simulation.compartment_array(), dtype=np.float64)
+        compartments.flags.writeable = False
+        # The store's RGBA buffer in region order, handed to MapRenderer as-is. It is
+        # copied (one memcpy) like compartments: the worker keeps recolouring the live
+        # buffer while the render thread draws this snapshot.
+        colours = self.simulation.store.colours.copy()
+        colours.flags.writeable = False
+        return SimSnapshot(
+            self.tick_count,
+            self.day_count,
+            self.started,
+            self._region_index,
+            compartments,
+            colours,
+            self.simulation.totals,
+        )
@@ -0,0 +1,805 @@
+"""
+simulation.py
+
+Simulation core: Region state, the SEIRD update rules and world construction.
+
+This module deliberately does NOT import pygame, so headless batch runs and
+worker processes can use it without a display or SDL. Rendering lives in
+map_system.py (which re-exports these names for existing callers).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from adjacency import LandGraph
+from air_travel import AirNetwork
+from region_store import Region, RegionStore, visual_severity_ratio
+from vector_engine import (
+    EXPORT_MIN_ACTIVE,
+    NEVER_EXPORTED,
+    STATUS_GRADIENT,
+    VectorEngine,
+    S,
+    E,
+    I,
+    R,
+    D,
+    export_chance,
+    export_seed,
+    status_colours,
+)
+
+# -----------------------------------------------------------------------------
+# World data import (single source of truth)
+# -----------------------------------------------------------------------------
+# REGION_CONFIG + LAND_CONNECTIONS belong in region_data.py because they are
+# “content/balancing data”, not algorithms. This keeps your simulation code stable
+# even if you rebalance populations or borders later.
+
+# The try statement is used to attempt operations that may fail and to handle predictable
+# errors gracefully, preventing the program from crashing while providing meaningful feedback.
+try:
+    from region_data import REGION_CONFIG, LAND_CONNECTIONS
+except ImportError as e:
+    raise ImportError(
+        "Could not import REGION_CONFIG / LAND_CONNECTIONS from region_data.py. "
+        "Ensure region_data.py is in the same folder as main.py and simulation.py."
+    ) from e
+
+
+class GlobalTotals(NamedTuple):
+    """World-wide compartment totals (see Simulation.totals)."""
+
+    susceptible: float
+    exposed: float
+    infected: float
+    recovered: float
+    dead: float
+
+    @property
+    def active(self) -> float:
+        """Exposed + infected: everyone currently carrying the disease."""
+        return self.exposed + self.infected
+
+    @property
+    def living(self) -> float:
+        return self.susceptible + self.exposed + self.infected + self.recovered
+
+
+def region_status_colour(ratio: float):
+    """Map a 0..1 severity ratio to a clear game-style gradient (one region).
+
+    Scalar form of vector_engine.status_colours, which the engines use to colour the
+    map. Both read their stops from vector_engine.STATUS_GRADIENT; tune them there.
+    """
+
+    # Clamp
+    if ratio < 0.0:
+        ratio = 0.0
+    if ratio > 1.0:
+        ratio = 1.0
+
+    # The last stop whose threshold the ratio has reached (the first starts at 0.0).
+    for start, a, b, span in STATUS_GRADIENT:
+        if ratio >= start:
+            stop = (start, a, b, span)
+
+    start, a, b, span = stop
+    t = (ratio - start) / span
+    # int() truncates, matching status_colours.
+    return (
+        int(a[0] + (b[0] - a[0]) * t),
+        int(a[1] + (b[1] - a[1]) * t),
+        int(a[2] + (b[2] - a[2]) * t),
+        255,
+    )
+
+
+class Simulation:
+    """
+    Simulation scaffold.
+
+    What it does now:
+    - tracks time as ticks
+    - keeps region colours consistent with current visual severity (infections + weighted deaths)
+    - advances per-region SEIRD state once per in-game day (update_one_day)
+    - keeps every region's state in one RegionStore (see region_store.py); the Region
+      objects in `regions` are views onto it, so they always show live state
+    - engine="loop" walks the regions one by one; engine="vector" advances the store's
+      state array in place with NumPy (see vector_engine.py)
+
+    - seeds Exposed by air travel once per day when air_routes are supplied (see air_travel.py)
+
+    What it does NOT do yet:
+    - no cure effort system yet
+    """
+
+    ENGINES = ("loop", "vector")
+    INTEGRATORS = ("euler", "rk45")
+
+    def __init__(
+        self,
+        regions: dict[str, Region],
+        engine: str = "loop",
+        seed=None,
+        connections: dict[str, list[str]] | LandGraph = None,
+        air_routes: list[tuple[str, str, float]] | AirNetwork = None,
+        integrator: str = "euler",
+    ):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown simulation engine '{engine}'. Expected one of: {', '.join(self.ENGINES)}")
+        if integrator not in self.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{integrator}'. Expected one of: {', '.join(self.INTEGRATORS)}")
+        if integrator != "euler" and engine != "vector":
+            raise ValueError(f"integrator='{integrator}' needs engine='vector'")
+
+        # name -> Region view; see the `regions` property (forks build theirs lazily).
+        self._regions = regions
+        self.engine = engine
+
+        # integrator="euler" is the classic one clamped step per call. integrator="rk45"
+        # treats each call's time span (a tick or a day) as continuous time and lets an
+        # adaptive Dormand-Prince solver choose the steps (see integrator.py).
+        self.integrator = integrator
+        self.integrator_rtol = 1e-6
+        self.integrator_atol = 1e-3
+        self.last_step_count = 0
+        self.total_step_count = 0
+
+        # Region order is fixed for the lifetime of the simulation; every index-based
+        # structure (land graph, vector engine rows, RNG draws) uses this order.
+        self.region_names = list(regions.keys())
+
+        # All region fields live in column arrays; the Region objects passed in become
+        # views onto this store (it is reused as-is when they already are, e.g. from
+        # build_regions_from_config).
+        self.store = RegionStore.adopt(regions)
+
+        # Land borders are compiled once into CSR arrays (symmetry is checked here), so
+        # the day-boundary export step works on integer indices instead of name lookups.
+        # An already compiled LandGraph (e.g. from world_gen) is used as-is.
+        if connections is None:
+            connections = LAND_CONNECTIONS
+        if isinstance(connections, LandGraph):
+            if connections.region_names != self.region_names:
+                raise ValueError("LandGraph region order does not match the regions passed to Simulation")
+            self.land_graph = connections
+        else:
+            self.land_graph = LandGraph.from_connections(self.region_names, connections)
+
+        # Air travel is optional: without routes (e.g. synthetic test worlds) only land spread runs.
+        # A prebuilt AirNetwork (e.g. from a compiled world file) is used as-is.
+        self.air_network = None
+        if isinstance(air_routes, AirNetwork):
+            if air_routes.region_names != self.region_names:
+                raise ValueError("AirNetwork region order does not match the regions passed to Simulation")
+            self.air_network = air_routes
+        elif air_routes is not None:
+            self.air_network = AirNetwork(self.region_names, air_routes)
+
+        self.sim_time_ticks = 0
+
+        # These counters let the same update method support either:
+        # - daily updates (called once per day)
+        # - smooth updates (called multiple times per day)
+        self.day_count = 0
+        self._tick_in_day = 0
+        self._assumed_ticks_per_day = 20
+
+        # Export cooldown (region -> last day it successfully exported).
+        self.last_export_day: dict[str, int] = {}
+
+        # Running global S/E/I/R/D totals and the number of regions with local cases.
+        # They are updated from each step's flows instead of re-summed over every region,
+        # so the HUD and the persistence-floor check are O(1). Float totals pick up a
+        # little rounding drift, so they are recounted every `totals_resync_days` days;
+        # the active-region count is an integer and always exact.
+        self._totals = [0.0] * 5
+        self._active_regions = 0
+        self.totals_resync_days = 30
+
+        # Each Simulation owns its random stream, so runs replay exactly from `seed` and
+        # several simulations can run side by side without touching the global RNG.
+        # seed=None draws fresh OS entropy (non-reproducible, like the old global RNG).
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        # Optional profiling.PhaseTimer: when set, update_one_day records how long each
+        # phase takes (sim.compartments / sim.land_export / sim.air_travel / sim.colours).
+        self.profiler = None
+
+        # engine="vector" advances all regions at once with array operations. It works on
+        # the store's own state and airport arrays (no copies), so Region views, the HUD
+        # and the renderer see its results without any syncing.
+        self._vector = None
+        if engine == "vector":
+            self._vector = VectorEngine(
+                populations=self.store.population,
+                healthcare_scores=self.store.healthcare,
+                airports_open=self.store.airports_open,
+                land_graph=self.land_graph,
+                state=self.store.state,
+            )
+
+        self.resync_totals()
+
+    @property
+    def totals(self) -> GlobalTotals:
+        """World-wide compartment totals (read-only, O(1))."""
+        return GlobalTotals(*self._totals)
+
+    @property
+    def regions(self) -> dict[str, Region]:
+        """
+        name -> Region view onto self.store, in region_names order.
+
+        A fork starts without this dict and builds it on first access, so forking
+        costs a few array copies rather than one Python object per region.
+        """
+        if self._regions is None:
+            self._regions = self.store.regions()
+        return self._regions
+
+    @property
+    def active_regions(self) -> int:
+        """How many regions currently have exposed or infected people."""
+        return self._active_regions
+
+    def resync_totals(self):
+        """
+        Recount totals from the regions.
+
+        Runs periodically on its own; call it directly after changing Region
+        compartments from outside the Simulation.
+        """
+        state = self.store.state
+        self._totals = state.sum(axis=0).tolist()
+        self._active_regions = int(np.count_nonzero((state[:, E] + state[:, I]) > 0.0))
+
+    def land_neighbours(self, region_name: str) -> list[str]:
+        # Name-based view of the compiled graph (the update loop itself uses indices).
+        return self.land_graph.neighbour_names(region_name)
+
+    def update_one_tick(self):
+        self.sim_time_ticks += 1
+
+    def _export_draws(self):
+        """Batched uniforms for one day of land exports, shape (regions, 2)."""
+        return self.rng.random((len(self.region_names), 2))
+
+    def set_airports_open(self, region_name: str, is_open: bool):
+        """Open/close a region's airports (same as Region.set_airports_open: both engines read the store)."""
+        self.store.region(self.store.index[region_name]).set_airports_open(is_open)
+
+    def seed_infection(self, region_name: str, amount: float):
+        """Move up to `amount` people from Susceptible to Infected in one region (outbreak start)."""
+        region = self.store.region(self.store.index[region_name])
+        was_active = (region.exposed + region.infected) > 0.0
+        seed = min(amount, region.susceptible)
+        region.susceptible -= seed
+        region.infected += seed
+
+        self._totals[S] -= seed
+        self._totals[I] += seed
+        self._active_regions += ((region.exposed + region.infected) > 0.0) - was_active
+        return seed
+
+    def update_one_day(
+        self,
+        infectivity_rate,
+        severity_rate,
+        lethality_rate,
+        incubation_days,
+        immunity_decay_rate=0.01,
+        min_pressure=0.03,
+        export_base_chance=0.04,
+        export_cooldown_days=8,
+        export_seed_base=25,
+        air_seed_scale=1e-5,
+        air_seed_cap=250.0,
+    ):
+        # Auto-detect whether the caller is passing per-tick rates (small) or per-day rates (large).
+        # If you divide your rates in main.py to get smoother motion, this keeps behaviour consistent.
+        # Detect smoothing mode based on infectivity/severity only.
+        # Lethality is a fraction of resolving cases, so it should NOT affect tick/day detection.
+        # np.all() lets the vector engine take per-region rate vectors as well as plain floats.
+        per_tick_mode = bool(np.all(np.asarray(infectivity_rate) < 0.5) and np.all(np.asarray(severity_rate) < 0.5))
+
+        ticks_per_day = self._assumed_ticks_per_day if per_tick_mode else 1
+        day_fraction = 1.0 / ticks_per_day
+
+        # Advance time. Only bump day_count when a full day has elapsed.
+        if per_tick_mode:
+            self._tick_in_day += 1
+            if self._tick_in_day >= ticks_per_day:
+                self._tick_in_day = 0
+                self.day_count += 1
+        else:
+            self.day_count += 1
+
+        day_boundary = (not per_tick_mode) or (self._tick_in_day == 0)
+
+        profiler = self.profiler
+        mark = profiler.now() if profiler is not None else 0
+
+        if self._vector is not None:
+            self._update_vectorized(
+                infectivity_rate,
+                severity_rate,
+                lethality_rate,
+                incubation_days,
+                immunity_decay_rate,
+                min_pressure,
+                export_cooldown_days,
+                export_seed_base,
+                air_seed_scale,
+                air_seed_cap,
+                ticks_per_day,
+                day_fraction,
+                day_boundary,
+                profiler,
+                mark,
+            )
+            return
+
+        if incubation_days <= 0:
+            incubation_days = 1
+
+        self.last_step_count = 1
+        self.total_step_count += 1
+
+        # Global activity check: keeps the disease “alive” while there are still cases anywhere.
+        # This prevents the simulation stalling because pressure collapses to ~0 late-game.
+        # (Same as summing E + I over every region and testing > 0, without the pass.)
+        disease_exists = self._active_regions > 0
+
+        # The loop runs on plain Python lists pulled from the region store once per call
+        # (one list per compartment) and written back in one go at the end: reading
+        # floats out of a list is far cheaper than a property or array access each.
+        # Columns rather than per-region rows: 100k small row lists per call would be
+        # container objects for the cyclic GC to keep scanning, plain floats are not.
+        store = self.store
+        s_col, e_col, i_col, r_col, d_col = store.state.T.tolist()
+        populations = store.population.tolist()
+        healthcare_scores = store.healthcare.tolist()
+
+        # Flows applied this step, folded into the running totals after the loop.
+        d_s = d_e = d_i = d_r = d_d = 0.0
+        d_active = 0
+
+        for k, pop in enumerate(populations):
+            if pop <= 0:
+                continue
+
+            s = s_col[k]
+            e = e_col[k]
+            i = i_col[k]
+            r = r_col[k]
+            d = d_col[k]
+
+            # Mild healthcare effect (kept intentionally small for now; easy to tune later).
+            spread_scale = 1.0 - (0.25 * healthcare_scores[k])
+            death_scale = 1.0 - (0.25 * healthcare_scores[k])
+            eff_infectivity = infectivity_rate * spread_scale
+            eff_lethality = lethality_rate * death_scale
+
+            pressure = 0.0
+            if pop > 0:
+                pressure = i / pop
+
+            # Persistence floor (eradication still possible):
+            # - Only applies while disease exists somewhere globally.
+            # - Only applies to regions that already have local cases (E or I), so it does not
+            #   “spawn” infection in clean regions.
+            if disease_exists and (i > 0.0 or e > 0.0) and pressure < min_pressure:
+                pressure = min_pressure
+
+            # S -> E
+            new_e = s * eff_infectivity * pressure
+            if new_e > s:
+                new_e = s
+            if new_e < 0.0:
+                new_e = 0.0
+
+            # E -> I (incubation)
+            new_i = e / (incubation_days * ticks_per_day)
+            if new_i > e:
+                new_i = e
+            if new_i < 0.0:
+                new_i = 0.0
+
+            # I -> resolved (R or D)
+            resolving = i * severity_rate
+            if resolving > i:
+                resolving = i
+            if resolving < 0.0:
+                resolving = 0.0
+
+            # resolved -> deaths
+            new_d = resolving * eff_lethality
+            if new_d > resolving:
+                new_d = resolving
+            if new_d < 0.0:
+                new_d = 0.0
+
+            new_r = resolving - new_d
+
+            # Immunity decay (R -> S). Default is 0.01 unless overridden by caller.
+            # Treat immunity_decay_rate as "per day" and scale it down when updating multiple times per day.
+            lost_immunity = r * (immunity_decay_rate * day_fraction)
+            if lost_immunity > r:
+                lost_immunity = r
+            if lost_immunity < 0.0:
+                lost_immunity = 0.0
+
+            s_next = (s - new_e) + lost_immunity
+            e_next = e + new_e - new_i
+            i_next = i + new_i - resolving
+            r_next = (r + new_r) - lost_immunity
+
+            # Guard against tiny negative drift from float ops.
+            if s_next < 0.0:
+                s_next = 0.0
+            if e_next < 0.0:
+                e_next = 0.0
+            if i_next < 0.0:
+                i_next = 0.0
+            if r_next < 0.0:
+                r_next = 0.0
+
+            s_col[k] = s_next
+            e_col[k] = e_next
+            i_col[k] = i_next
+            r_col[k] = r_next
+            d_col[k] = d + new_d
+
+            d_s += s_next - s
+            d_e += e_next - e
+            d_i += i_next - i
+            d_r += r_next - r
+            d_d += new_d
+            d_active += ((e_next + i_next) > 0.0) - ((e + i) > 0.0)
+
+        if profiler is not None:
+            mark = profiler.lap("sim.compartments", mark)
+
+        # Land transmission (event-based): occasional export attempts that seed Exposed.
+        # Run exports once per simulated day, even if disease dynamics are updated multiple times per day.
+        if day_boundary:
+            # One row of uniforms per region per day: [export roll, neighbour pick].
+            # Drawing for every region (not just exporters) keeps the stream independent of
+            # outbreak state and matches the vector engine draw-for-draw.
+            draws = self._export_draws().tolist()
+            offsets = self.land_graph.offsets
+            neighbour_indices = self.land_graph.indices
+            region_names = self.region_names
+
+            for k, src_name in enumerate(region_names):
+                # Allow exports during incubation so spread doesn't feel "stuck".
+                if (e_col[k] + i_col[k]) <= 0.0:
+                    continue
+
+                first = offsets[k]
+                degree = offsets[k + 1] - first
+                if degree == 0:
+                    continue
+
+                last = self.last_export_day.get(src_name, NEVER_EXPORTED)
+                if (self.day_count - last) < export_cooldown_days:
+                    continue
+
+                # Threshold-triggered exports (Plague Inc pacing):
+                # A region only starts exporting once it has a meaningful outbreak.
+                active = (e_col[k] + i_col[k])
+
+                # Daily-scale infectivity keeps exports consistent when main.py smooths rates.
+                daily_infectivity = infectivity_rate * ticks_per_day
+
+                # Base chance is set by outbreak size; infectivity then scales it.
+                # The bands are shared with the vector engine (see vector_engine.py).
+                if active < EXPORT_MIN_ACTIVE:
+                    continue
+
+                export_roll, neighbour_pick = draws[k]
+                if export_roll >= export_chance(active, daily_infectivity):
+                    continue
+
+                dst = neighbour_indices[first + int(neighbour_pick * degree)]
+                if s_col[dst] <= 0.0:
+                    continue
+
+                # Seed a small Exposed foothold so the neighbour ramps up after incubation.
+                seed = export_seed(export_seed_base, daily_infectivity)
+                if seed > s_col[dst]:
+                    seed = s_col[dst]
+
+                dst_was_active = (e_col[dst] + i_col[dst]) > 0.0
+                s_col[dst] -= seed
+                e_col[dst] += seed
+
+                if s_col[dst] < 0.0:
+                    s_col[dst] = 0.0
+
+                d_s -= seed
+                d_e += seed
+                d_active += ((e_col[dst] + i_col[dst]) > 0.0) - dst_was_active
+
+                self.last_export_day[src_name] = self.day_count
+
+            if profiler is not None:
+                mark = profiler.lap("sim.land_export", mark)
+
+            # Air transmission: infectious travellers seed Exposed at the other end of each route.
+            if self.air_network is not None:
+                active = [e + i for e, i in zip(e_col, i_col)]
+                seeds = self.air_network.seeds(
+                    self.rng, active, populations, store.airports_open, air_seed_scale, air_seed_cap
+                )
+
+                seeds = seeds.tolist()
+                for idx, seed in enumerate(seeds):
+                    if seed <= 0.0:
+                        continue
+                    seed = min(seed, s_col[idx])
+                    dst_was_active = (e_col[idx] + i_col[idx]) > 0.0
+                    s_col[idx] -= seed
+                    e_col[idx] += seed
+
+                    d_s -= seed
+                    d_e += seed
+                    d_active += ((e_col[idx] + i_col[idx]) > 0.0) - dst_was_active
+
+                if profiler is not None:
+                    mark = profiler.lap("sim.air_travel", mark)
+
+        state = store.state
+        state[:, S] = s_col
+        state[:, E] = e_col
+        state[:, I] = i_col
+        state[:, R] = r_col
+        state[:, D] = d_col
+
+        totals = self._totals
+        totals[S] += d_s
+        totals[E] += d_e
+        totals[I] += d_i
+        totals[R] += d_r
+        totals[D] += d_d
+        self._active_regions += d_active
+        if day_boundary and self.day_count % self.totals_resync_days == 0:
+            self.resync_totals()
+
+        # Scalar severity (the reference formula), then one vectorized pass to RGBA: same
+        # colours as region_status_colour, without building a tuple per region.
+        store.colours[:] = status_colours(
+            [visual_severity_ratio(i, d, pop) for i, d, pop in zip(i_col, d_col, populations)]
+        )
+
+        if profiler is not None:
+            profiler.lap("sim.colours", mark)
+
+    def _update_vectorized(
+        self,
+        infectivity_rate,
+        severity_rate,
+        lethality_rate,
+        incubation_days,
+        immunity_decay_rate,
+        min_pressure,
+        export_cooldown_days,
+        export_seed_base,
+        air_seed_scale,
+        air_seed_cap,
+        ticks_per_day,
+        day_fraction,
+        day_boundary,
+        profiler=None,
+        mark=0,
+    ):
+        """Same rules as the loop in update_one_day, applied to all regions as array operations."""
+        engine = self._vector
+        if self.integrator == "rk45":
+            # Rates arrive scaled to the caller's step; the ODE wants them per day. asarray
+            # so per-region rate lists scale element-wise (a list * int would repeat it).
+            stats = engine.advance_adaptive(
+                day_fraction,
+                np.asarray(infectivity_rate, dtype=np.float64) * ticks_per_day,
+                np.asarray(severity_rate, dtype=np.float64) * ticks_per_day,
+                lethality_rate,
+                incubation_days,
+                immunity_decay_rate,
+                min_pressure,
+                engine.disease_exists(),
+                rtol=self.integrator_rtol,
+                atol=self.integrator_atol,
+            )
+            self.last_step_count = stats.accepted
+        else:
+            engine.step(
+                infectivity_rate,
+                severity_rate,
+                lethality_rate,
+                incubation_days,
+                immunity_decay_rate,
+                min_pressure,
+                ticks_per_day,
+                day_fraction,
+                engine.disease_exists(),
+            )
+            self.last_step_count = 1
+        self.total_step_count += self.last_step_count
+
+        if profiler is not None:
+            mark = profiler.lap("sim.compartments", mark)
+
+        if day_boundary:
+            exported = engine.land_exports(
+                self._export_draws(),
+                self.day_count,
+                infectivity_rate,
+                ticks_per_day,
+                export_cooldown_days,
+                export_seed_base,
+            )
+            for idx in exported:
+                self.last_export_day[engine.region_names[idx]] = self.day_count
+
+            if profiler is not None:
+                mark = profiler.lap("sim.land_export", mark)
+
+            if self.air_network is not None:
+                seeds = self.air_network.seeds(
+                    self.rng,
+                    engine.state[:, E] + engine.state[:, I],
+                    engine.population,
+                    engine.airports_open,
+                    air_seed_scale,
+                    air_seed_cap,
+                )
+                engine.apply_exposure(seeds)
+
+                if profiler is not None:
+                    mark = profiler.lap("sim.air_travel", mark)
+
+        self._refresh_vector_colours()
+
+        if profiler is not None:
+            profiler.lap("sim.colours", mark)
+
+    def _refresh_vector_colours(self):
+        """Recompute every region's colour from the (shared) state array, and the totals."""
+        self.store.colours[:] = status_colours(self._vector.visual_severity_ratios())
+
+        # The arrays are already in memory, so one C-level reduction keeps the totals
+        # exact here (there is no per-region Python pass to save).
+        self.resync_totals()
+
+    def compartment_array(self):
+        """
+        S/E/I/R/D for every region as an (n, 5) float64 array, rows in region_names order.
+
+        This is the region store's live state array (no copy): treat it as read-only.
+        """
+        return self.store.state
+
+    def fork(self, seed=None):
+        """
+        Branch a new Simulation from the current state for what-if runs.
+
+        Static config (region order, land graph, air network, populations, healthcare
+        scaling) is shared with the parent. Only mutable state is copied: compartments,
+        export cooldowns, airport flags, counters and the RNG. By default the branch
+        continues the parent's random stream exactly; pass `seed` to give it its own.
+        The branch's Region views are only created if child.regions is accessed.
+        """
+        child = Simulation.__new__(Simulation)
+        child.__dict__.update(self.__dict__)
+
+        child.store = self.store.copy()
+        child._regions = None
+        child.last_export_day = dict(self.last_export_day)
+        child._totals = list(self._totals)
+        # A branch runs on its own; it must not write into the parent's timing buffers.
+        child.profiler = None
+
+        if seed is None:
+            child.rng = _copy_generator(self.rng)
+        else:
+            child.seed = seed
+            child.rng = np.random.default_rng(seed)
+
+        if self._vector is not None:
+            child._vector = self._vector.fork(state=child.store.state, airports_open=child.store.airports_open)
+
+        return child
+
+    def export_state(self) -> dict:
+        """
+        Everything that changes while the simulation runs, as plain arrays and numbers.
+
+        Static config (populations, healthcare, borders, routes) is not included; it is
+        rebuilt from region data. Used by checkpoint.py to save/restore runs.
+        """
+        adaptive_h = self._vector.adaptive_h if self._vector is not None else 0.0
+
+        return {
+            "region_names": list(self.region_names),
+            "compartments": self.compartment_array().copy(),
+            "last_export": np.array(
+                [self.last_export_day.get(name, NEVER_EXPORTED) for name in self.region_names], dtype=np.int64
+            ),
+            "airports_open": self.store.airports_open.copy(),
+            "day_count": self.day_count,
+            "tick_in_day": self._tick_in_day,
+            "sim_time_ticks": self.sim_time_ticks,
+            "total_step_count": self.total_step_count,
+            "adaptive_h": adaptive_h,
+            "rng_state": self.rng.bit_generator.state,
+        }
+
+    def import_state(self, state: dict):
+        """Overwrite the running state with one produced by export_state() (same world required)."""
+        if list(state["region_names"]) != self.region_names:
+            raise ValueError("Saved state was produced for a different set of regions")
+
+        compartments = np.asarray(state["compartments"], dtype=np.float64)
+        last_export = np.asarray(state["last_export"], dtype=np.int64)
+        airports_open = np.asarray(state["airports_open"], dtype=bool)
+
+        self.day_count = int(state["day_count"])
+        self._tick_in_day = int(state["tick_in_day"])
+        self.sim_time_ticks = int(state["sim_time_ticks"])
+        self.total_step_count = int(state["total_step_count"])
+        self.rng.bit_generator.state = state["rng_state"]
+
+        self.last_export_day = {
+            name: day for name, day in zip(self.region_names, last_export.tolist()) if day != NEVER_EXPORTED
+        }
+
+        # The vector engine shares these arrays, so this updates both engines.
+        self.store.state[:] = compartments
+        self.store.airports_open[:] = airports_open
+
+        if self._vector is not None:
+            self._vector.last_export[:] = last_export
+            if state["adaptive_h"] > 0.0:
+                self._vector.adaptive_h = float(state["adaptive_h"])
+            self._refresh_vector_colours()
+        else:
+            self.store.colours[:] = status_colours(
+                [
+                    visual_severity_ratio(i, d, pop)
+                    for i, d, pop in zip(compartments[:, I].tolist(), compartments[:, D].tolist(), self.store.population.tolist())
+                ]
+            )
+            self.resync_totals()
+
+
+def _copy_generator(rng):
+    """Copy a NumPy Generator so the copy continues from exactly the same point."""
+    bit_generator = type(rng.bit_generator)(0)
+    bit_generator.state = rng.bit_generator.state
+    return np.random.Generator(bit_generator)
+
+
+def build_regions_from_config(config: dict[str, dict] | None = None) -> dict[str, Region]:
+    """
+    Builds Region objects using REGION_CONFIG (or `config`, a dict of the same shape,
+    e.g. from world_gen.GeneratedWorld.region_config()).
+
+    Hard requirement:
+    - REGION_CONFIG keys must match mask filenames
+      e.g. "china" -> assets/maps/masks/china_mask.png
+    """
+    if config is None:
+        config = REGION_CONFIG
+
+    # One store for the whole world; each Region is a view onto its row.
+    store = RegionStore(
+        list(config.keys()),
+        population=[cfg["population"] for cfg in config.values()],
+        healthcare=[cfg["healthcare_score"] for cfg in config.values()],
+        airports_open=[cfg["airports_open"] for cfg in config.values()],
+    )
+    return store.regions()
@@ -0,0 +1,28 @@
+"""
+text_cache.py
+
+LRU cache of rendered text surfaces.
+
+font.render() rasterizes glyphs every call, which made it one of the biggest
+per-frame costs: the HUD re-rendered the same labels and numbers 60 times a
+second. TextCache keys surfaces on (font, text, colour, antialias), so a label
+is rendered once and after that is just a blit. Values that keep changing (day
+counter, totals) cycle through the cache and fall out of it via LRU eviction.
+
+Cached surfaces are shared: blit them, never draw on them or change their alpha.
+"""
+
+import pygame
+
+from lru import LRUCache
+
+
+class TextCache(LRUCache):
+    """Bounded LRU of font.render() results."""
+
+    def __init__(self, max_entries: int = 512):
+        super().__init__(max_entries)
+
+    def render(self, font: pygame.font.Font, text: str, colour, antialias: bool = True) -> pygame.Surface:
+        """Same as font.render(text, antialias, colour), cached."""
+        return self.get_or_build((font, text, tuple(colour), antialias), font.render, text, antialias, colour)
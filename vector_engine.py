@@ -0,0 +1,399 @@
+"""
+vector_engine.py
+
+Array-backed SEIRD engine used by Simulation when engine="vector".
+
+All compartments live in one contiguous float64 array with one row per region:
+
+    state[:, S]  susceptible
+    state[:, E]  exposed
+    state[:, I]  infected
+    state[:, R]  recovered
+    state[:, D]  dead
+
+Every region is advanced with the same handful of array operations, so the cost
+of a tick no longer grows with Python attribute access per region.
+
+The maths deliberately mirrors the per-region loop in Simulation.update_one_day
+(same operation order, same clamps) so both engines produce identical numbers;
+engine_check.py runs both and compares them day by day.
+"""
+
+import heapq
+
+from integrator import integrate
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "The vectorized simulation engine needs NumPy. Install it with: pip install numpy"
+    ) from e
+
+
+# last_export_day value for regions that have never exported (the cooldown default).
+NEVER_EXPORTED = -10_000
+
+# Land export tuning (Plague Inc pacing), shared by both engines so they cannot drift
+# apart. A region exports only once it has a meaningful outbreak (E + I at or above
+# EXPORT_MIN_ACTIVE); its daily chance is a base set by outbreak size, scaled by daily
+# infectivity and capped. Bands are tuned for gradual "country-by-country" spread.
+EXPORT_MIN_ACTIVE = 2000.0
+EXPORT_BANDS = ((20000.0, 0.01), (100000.0, 0.03))  # (active below, base chance)
+EXPORT_TOP_CHANCE = 0.06                             # base chance above the last band
+EXPORT_CHANCE_CAP = 0.18
+# Exposed people seeded in the neighbour per export: seed_base * daily infectivity, clamped.
+EXPORT_SEED_MIN = 1.0
+EXPORT_SEED_MAX = 250.0
+
+
+def export_chance(active: float, daily_infectivity: float) -> float:
+    """Daily land export chance for a region with `active` (E + I) cases."""
+    if active < EXPORT_MIN_ACTIVE:
+        return 0.0
+    base = EXPORT_TOP_CHANCE
+    for below, band_chance in EXPORT_BANDS:
+        if active < below:
+            base = band_chance
+            break
+
+    chance = base * daily_infectivity
+    if chance > EXPORT_CHANCE_CAP:
+        chance = EXPORT_CHANCE_CAP
+    return chance
+
+
+def export_seed(seed_base: float, daily_infectivity: float) -> float:
+    """Exposed people one land export seeds (before capping at the neighbour's Susceptible)."""
+    seed = seed_base * daily_infectivity
+    if seed < EXPORT_SEED_MIN:
+        seed = EXPORT_SEED_MIN
+    if seed > EXPORT_SEED_MAX:
+        seed = EXPORT_SEED_MAX
+    return seed
+
+
+# Column indices into VectorEngine.state.
+S, E, I, R, D = range(5)
+COMPARTMENTS = ("susceptible", "exposed", "infected", "recovered", "dead")
+
+
+def as_region_vector(value, n: int):
+    """Broadcast a scalar or per-region sequence to a float64 vector of length n."""
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim == 0:
+        return np.full(n, float(arr))
+    if arr.shape != (n,):
+        raise ValueError(f"Expected a scalar or {n} per-region values, got shape {arr.shape}")
+    return arr
+
+
+class VectorEngine:
+    """
+    Holds SEIRD compartments for every region as arrays and steps them together.
+
+    Parameters passed to step() may be plain floats or per-region vectors
+    (one value per row, same order as region_names).
+    """
+
+    def __init__(self, populations, healthcare_scores, airports_open, land_graph, state=None):
+        self.land_graph = land_graph
+        self.region_names = land_graph.region_names
+        self.index = land_graph.index
+        n = len(self.region_names)
+
+        self.population = np.asarray(populations, dtype=np.float64)
+        self.healthcare = np.asarray(healthcare_scores, dtype=np.float64)
+        if self.population.shape != (n,) or self.healthcare.shape != (n,):
+            raise ValueError("populations and healthcare_scores must have one value per region")
+
+        self.live = self.population > 0
+        self._all_live = bool(self.live.all())
+
+        # A bool array passed in is used as-is (not copied), so the caller's airport
+        # flags (e.g. a RegionStore column) and the engine stay the same buffer.
+        self.airports_open = np.asarray(airports_open, dtype=bool)
+
+        # Healthcare scaling is fixed per region, so compute it once.
+        self.healthcare_scale = 1.0 - (0.25 * self.healthcare)
+
+        # state may be supplied (e.g. RegionStore.state); it is then advanced in place.
+        if state is None:
+            state = np.zeros((n, 5), dtype=np.float64)
+            state[:, S] = self.population
+        elif not (isinstance(state, np.ndarray) and state.dtype == np.float64 and state.shape == (n, 5)):
+            raise ValueError(f"state must be a float64 array of shape ({n}, 5)")
+        self.state = state
+
+        # Mirror of Simulation.last_export_day for vectorized cooldown checks.
+        self.last_export = np.full(n, NEVER_EXPORTED, dtype=np.int64)
+
+        # Step size carried between adaptive integrator calls (in days).
+        self.adaptive_h = 0.1
+
+    def __len__(self):
+        return len(self.region_names)
+
+    def fork(self, state=None, airports_open=None):
+        """
+        Copy of this engine that shares static arrays and owns copies of the mutable ones.
+
+        Pass state / airports_open to adopt already-copied buffers (e.g. a forked RegionStore).
+        """
+        child = VectorEngine.__new__(VectorEngine)
+        child.__dict__.update(self.__dict__)
+        child.state = self.state.copy() if state is None else state
+        child.last_export = self.last_export.copy()
+        child.airports_open = self.airports_open.copy() if airports_open is None else airports_open
+        return child
+
+    def disease_exists(self) -> bool:
+        return bool(np.any((self.state[:, E] + self.state[:, I]) > 0.0))
+
+    def step(
+        self,
+        infectivity_rate,
+        severity_rate,
+        lethality_rate,
+        incubation_days,
+        immunity_decay_rate,
+        min_pressure,
+        ticks_per_day: int,
+        day_fraction: float,
+        disease_exists: bool,
+    ):
+        """Advance every region by one compartment update (one tick or one day)."""
+        st = self.state
+        s = st[:, S]
+        e = st[:, E]
+        i = st[:, I]
+        r = st[:, R]
+        d = st[:, D]
+        pop = self.population
+
+        incubation_days = np.asarray(incubation_days, dtype=np.float64)
+        incubation_days = np.where(incubation_days <= 0, 1.0, incubation_days)
+
+        eff_infectivity = infectivity_rate * self.healthcare_scale
+        eff_lethality = lethality_rate * self.healthcare_scale
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pressure = np.where(self.live, i / pop, 0.0)
+
+        if disease_exists:
+            has_cases = (i > 0.0) | (e > 0.0)
+            pressure = np.where(has_cases & (pressure < min_pressure), min_pressure, pressure)
+
+        # S -> E
+        new_e = np.maximum(np.minimum(s * eff_infectivity * pressure, s), 0.0)
+
+        # E -> I (incubation)
+        new_i = np.maximum(np.minimum(e / (incubation_days * ticks_per_day), e), 0.0)
+
+        # I -> resolved (R or D)
+        resolving = np.maximum(np.minimum(i * severity_rate, i), 0.0)
+
+        # resolved -> deaths
+        new_d = np.maximum(np.minimum(resolving * eff_lethality, resolving), 0.0)
+        new_r = resolving - new_d
+
+        # Immunity decay (R -> S), treated as a per-day rate.
+        lost_immunity = np.maximum(np.minimum(r * (immunity_decay_rate * day_fraction), r), 0.0)
+
+        updated = np.empty_like(st)
+        updated[:, S] = (s - new_e) + lost_immunity
+        updated[:, E] = e + new_e - new_i
+        updated[:, I] = i + new_i - resolving
+        updated[:, R] = (r + new_r) - lost_immunity
+        updated[:, D] = d + new_d
+
+        # Guard against tiny negative drift from float ops (deaths only ever grow).
+        np.maximum(updated[:, :D], 0.0, out=updated[:, :D])
+
+        if self._all_live:
+            st[:] = updated
+        else:
+            st[self.live] = updated[self.live]
+
+    def derivatives(self, y, beta, sigma, gamma, mu, omega, min_pressure, disease_exists):
+        """
+        Continuous-time SEIRD rates (people per day) for state y, shape (n, 5).
+
+        Same model as step(), written as flows per unit time instead of per step:
+        S -> E at beta * pressure, E -> I at sigma, I resolves at gamma (a share mu
+        of that dies) and immunity wanes R -> S at omega.
+        """
+        s = y[:, S]
+        e = y[:, E]
+        i = y[:, I]
+        r = y[:, R]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pressure = np.where(self.live, i / self.population, 0.0)
+        if disease_exists:
+            has_cases = (i > 0.0) | (e > 0.0)
+            pressure = np.where(has_cases & (pressure < min_pressure), min_pressure, pressure)
+
+        infection = beta * s * pressure
+        onset = sigma * e
+        resolving = gamma * i
+        deaths = mu * resolving
+        waning = omega * r
+
+        dy = np.empty_like(y)
+        dy[:, S] = waning - infection
+        dy[:, E] = infection - onset
+        dy[:, I] = onset - resolving
+        dy[:, R] = (resolving - deaths) - waning
+        dy[:, D] = deaths
+        dy[~self.live] = 0.0
+        return dy
+
+    def advance_adaptive(
+        self,
+        span_days: float,
+        infectivity_per_day,
+        severity_per_day,
+        lethality_rate,
+        incubation_days,
+        immunity_decay_rate,
+        min_pressure,
+        disease_exists: bool,
+        rtol: float = 1e-6,
+        atol: float = 1e-3,
+    ):
+        """Integrate the compartments forward by span_days with adaptive RK45; returns StepStats."""
+        incubation_days = np.asarray(incubation_days, dtype=np.float64)
+        incubation_days = np.where(incubation_days <= 0, 1.0, incubation_days)
+
+        beta = infectivity_per_day * self.healthcare_scale
+        sigma = 1.0 / incubation_days
+        gamma = np.asarray(severity_per_day, dtype=np.float64)
+        # Euler clamps deaths to the resolving cases; the same cap here is a share <= 1.
+        mu = np.minimum(lethality_rate * self.healthcare_scale, 1.0)
+
+        def f(y):
+            return self.derivatives(y, beta, sigma, gamma, mu, immunity_decay_rate, min_pressure, disease_exists)
+
+        y, self.adaptive_h, stats = integrate(f, self.state, span_days, self.adaptive_h, rtol=rtol, atol=atol)
+        self.state[:] = y
+        return stats
+
+    def land_exports(
+        self,
+        draws,
+        day_count: int,
+        infectivity_rate,
+        ticks_per_day: int,
+        export_cooldown_days: int,
+        export_seed_base,
+    ) -> list[int]:
+        """
+        Run one day of land exports and return the indices that exported.
+
+        draws is the day's batch of uniforms, shape (n, 2): column 0 is the export
+        roll and column 1 picks the neighbour, one row per region.
+
+        Eligibility (neighbours, cooldown, outbreak size) is computed for all regions
+        at once; only regions over EXPORT_MIN_ACTIVE reach the Python loop.
+        Regions are still visited in index order, because an earlier export can push
+        a later region over the threshold within the same day.
+        """
+        n = len(self.region_names)
+        st = self.state
+        daily_infectivity = as_region_vector(infectivity_rate, n) * ticks_per_day
+        seed_base = as_region_vector(export_seed_base, n)
+
+        active = st[:, E] + st[:, I]
+        graph = self.land_graph
+        ready = (graph.degree > 0) & ((day_count - self.last_export) >= export_cooldown_days)
+        pending = np.flatnonzero(ready & (active >= EXPORT_MIN_ACTIVE)).tolist()
+        queued = set(pending)
+        heapq.heapify(pending)
+
+        exported = []
+        while pending:
+            src = heapq.heappop(pending)
+
+            active_src = st[src, E] + st[src, I]
+            if active_src < EXPORT_MIN_ACTIVE:
+                continue
+
+            if draws[src, 0] >= export_chance(active_src, daily_infectivity[src]):
+                continue
+
+            first = graph.offsets[src]
+            dst = graph.indices[first + int(draws[src, 1] * graph.degree[src])]
+            if st[dst, S] <= 0.0:
+                continue
+
+            seed = export_seed(seed_base[src], daily_infectivity[src])
+            if seed > st[dst, S]:
+                seed = st[dst, S]
+
+            st[dst, S] -= seed
+            st[dst, E] += seed
+            if st[dst, S] < 0.0:
+                st[dst, S] = 0.0
+
+            # A later region may just have crossed the export threshold.
+            if dst > src and dst not in queued and ready[dst]:
+                if (st[dst, E] + st[dst, I]) >= EXPORT_MIN_ACTIVE:
+                    heapq.heappush(pending, dst)
+                    queued.add(dst)
+
+            self.last_export[src] = day_count
+            exported.append(src)
+
+        return exported
+
+    def apply_exposure(self, seeds):
+        """Move up to seeds[k] people from Susceptible to Exposed in every region at once."""
+        st = self.state
+        moved = np.minimum(seeds, st[:, S])
+        st[:, S] -= moved
+        st[:, E] += moved
+
+    def visual_severity_ratios(self):
+        """Vectorized Region.visual_severity_ratio for every region."""
+        pop = self.population
+        with np.errstate(divide="ignore", invalid="ignore"):
+            infected_ratio = np.where(self.live, self.state[:, I] / pop, 0.0)
+            dead_ratio = np.where(self.live, self.state[:, D] / pop, 0.0)
+
+        v = (0.2 * np.minimum(1.0, infected_ratio * 3.0)) + (0.8 * (dead_ratio ** 3))
+
+        t = np.clip((dead_ratio - 0.96) / 0.04, 0.0, 1.0)
+        v = np.where(dead_ratio >= 0.96, (v * (1.0 - t)) + (1.0 * t), v)
+
+        v = np.clip(v, 0.0, 1.0)
+        return np.where(self.live, v, 0.0)
+
+
+# Map colour gradient over the 0..1 severity ratio: the one table behind both
+# status_colours and simulation.region_status_colour (deliberately simple to tune).
+# Each stop is (threshold, start RGB, end RGB, span); front-loaded so most of the
+# game stays green/yellow/red, dark red is reached at ~70%, and past that a region
+# fades to grey to signal it is effectively dead.
+STATUS_GRADIENT = (
+    (0.00, (0, 120, 0), (255, 210, 0), 0.12),  # green -> yellow
+    (0.12, (255, 210, 0), (220, 0, 0), 0.28),  # yellow -> red
+    (0.40, (220, 0, 0), (120, 0, 0), 0.30),  # red -> dark red
+    (0.70, (120, 0, 0), (40, 40, 40), 0.30),  # dark red -> death grey
+)
+
+
+def status_colours(ratios):
+    """Map 0..1 severity ratios to the STATUS_GRADIENT: returns an (n, 4) int array of RGBA values."""
+    ratios = np.clip(np.asarray(ratios, dtype=np.float64), 0.0, 1.0)
+    out = np.empty((ratios.shape[0], 4), dtype=np.int64)
+    out[:, 3] = 255
+
+    for start, a, b, span in STATUS_GRADIENT:
+        sel = ratios >= start
+        t = (ratios[sel] - start) / span
+        for ch in range(3):
+            # Truncate like int() in region_status_colour; values are never negative here.
+            out[sel, ch] = (a[ch] + (b[ch] - a[ch]) * t).astype(np.int64)
+
+    return out
@@ -0,0 +1,358 @@
+"""
+world_gen.py
+
+Seeded synthetic worlds for scale testing.
+
+region_data.py describes the real 18-region world by hand. generate_world(n, seed)
+builds a world of any size (thousands to a million regions) with the same
+ingredients:
+
+- populations: lognormal shares of a world total (a few huge regions, many small)
+- healthcare scores in 0..1
+- land borders: regions sit on a jittered grid; each is bordered by its grid
+  neighbours plus one randomly chosen diagonal per grid cell, which gives a
+  triangulated, planar-ish graph (degree ~6, like real maps). A fraction of
+  borders is removed as "water". Borders are always symmetric.
+- air routes: a few routes per region, with destinations weighted by population
+  (big regions become hubs) and passengers scaled by both populations
+- optionally an ID map (each pixel belongs to the nearest region centre) plus
+  per-region masks and a base map, written in the assets/maps layout that
+  MapRenderer reads
+
+The result is a GeneratedWorld holding plain arrays. It can be turned into the
+dict shapes the rest of the game uses (REGION_CONFIG / LAND_CONNECTIONS /
+REGION_ID_HEX), or handed straight to the simulation without the dicts:
+
+Usage:
+    from world_gen import generate_world
+
+    world = generate_world(10_000, seed=7)
+    simulation = world.simulation(engine="vector", seed=1)
+
+    # Same world through the config path
+    regions = build_regions_from_config(world.region_config())
+    simulation = Simulation(regions, connections=world.land_graph(), air_routes=world.air_routes())
+
+    # Map assets for a playable/renderable world (masks only sensible for small n)
+    world.write_map_assets("generated/maps", (1280, 720), masks=True)
+    renderer = MapRenderer("generated", (1280, 720), world.region_names, id_colours=world.id_colours())
+
+    python world_gen.py 100000 --seed 3           # print a summary
+"""
+
+import argparse
+import math
+import os
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+from adjacency import LandGraph
+from air_travel import AirNetwork
+
+# Rough real-world total, split across the generated regions.
+DEFAULT_WORLD_POPULATION = 8_000_000_000
+MIN_REGION_POPULATION = 1_000
+
+
+# -----------------------------------------------------------------------------
+# Array world -> game structures
+# -----------------------------------------------------------------------------
+# Shared by GeneratedWorld and world_loader.CompiledWorld (NamedTuples cannot take
+# a mixin base, so both bind these as methods). A "world" here is anything with
+# region_names, population, healthcare, airports_open, CSR offsets / indices and
+# route_origins / route_destinations / route_passengers arrays.
+
+
+def world_len(world) -> int:
+    return len(world.region_names)
+
+
+def world_land_graph(world) -> LandGraph:
+    """The land borders as a LandGraph (no dict round trip)."""
+    return LandGraph(world.region_names, world.offsets, world.indices)
+
+
+def world_air_network(world) -> AirNetwork:
+    return AirNetwork.from_arrays(world.region_names, world.route_origins, world.route_destinations, world.route_passengers)
+
+
+def world_region_config(world) -> dict[str, dict]:
+    """Same shape as region_data.REGION_CONFIG."""
+    return {
+        name: {"population": pop, "healthcare_score": hc, "airports_open": is_open}
+        for name, pop, hc, is_open in zip(
+            world.region_names,
+            world.population.tolist(),
+            world.healthcare.tolist(),
+            world.airports_open.tolist(),
+        )
+    }
+
+
+def world_connections(world) -> dict[str, list[str]]:
+    """Same shape as region_data.LAND_CONNECTIONS."""
+    names = world.region_names
+    offsets = world.offsets.tolist()
+    indices = world.indices.tolist()
+    return {name: [names[dst] for dst in indices[offsets[k]:offsets[k + 1]]] for k, name in enumerate(names)}
+
+
+def world_air_routes(world) -> list[tuple[str, str, float]]:
+    """Same shape as air_travel.load_air_routes()."""
+    names = world.region_names
+    return [
+        (names[o], names[d], p)
+        for o, d, p in zip(
+            world.route_origins.tolist(), world.route_destinations.tolist(), world.route_passengers.tolist()
+        )
+    ]
+
+
+def world_build_regions(world):
+    from simulation import build_regions_from_config
+
+    return build_regions_from_config(world_region_config(world))
+
+
+def world_simulation(world, **kwargs):
+    """A Simulation over this world (kwargs go to Simulation, e.g. engine, seed)."""
+    from simulation import Simulation
+
+    return Simulation(
+        world_build_regions(world),
+        connections=world_land_graph(world),
+        air_routes=world_air_network(world) if len(world.route_passengers) else None,
+        **kwargs,
+    )
+
+
+class GeneratedWorld(NamedTuple):
+    """A generated world as arrays; row k of every array is region_names[k]."""
+
+    region_names: list[str]
+    population: np.ndarray       # int64
+    healthcare: np.ndarray       # float64, 0..1
+    airports_open: np.ndarray    # bool
+    positions: np.ndarray        # (n, 2) region centres in the unit square (x, y)
+    offsets: np.ndarray          # land borders, CSR (see adjacency.py)
+    indices: np.ndarray
+    route_origins: np.ndarray    # air routes as parallel arrays
+    route_destinations: np.ndarray
+    route_passengers: np.ndarray
+    seed: int
+
+    __len__ = world_len
+    land_graph = world_land_graph
+    air_network = world_air_network
+    region_config = world_region_config
+    connections = world_connections
+    air_routes = world_air_routes
+    build_regions = world_build_regions
+    simulation = world_simulation
+
+    def id_colours(self) -> dict[str, str]:
+        """Same shape as region_data.REGION_ID_HEX: region k is colour k + 1 (black is never used)."""
+        return {name: f"{k + 1:06x}ff" for k, name in enumerate(self.region_names)}
+
+    def id_map(self, size: tuple[int, int]) -> np.ndarray:
+        """
+        (width, height) array of region index + 1 for each pixel (nearest region centre).
+
+        Regions smaller than a pixel at this size may own no pixels at all.
+        """
+        width, height = size
+        grid_w, grid_h = _grid_shape(len(self))
+        n = len(self)
+
+        xs = (np.arange(width) + 0.5) / width
+        ys = (np.arange(height) + 0.5) / height
+        px, py = np.meshgrid(xs, ys, indexing="ij")
+        col = np.minimum((px * grid_w).astype(np.int64), grid_w - 1)
+        row = np.minimum((py * grid_h).astype(np.int64), grid_h - 1)
+
+        # A jittered centre never leaves its own grid cell, so the nearest centre is
+        # always in the 3x3 block of cells around the pixel.
+        best = np.zeros(size, dtype=np.int64)
+        best_dist = np.full(size, np.inf)
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                r = row + d_row
+                c = col + d_col
+                cand = r * grid_w + c
+                valid = (r >= 0) & (r < grid_h) & (c >= 0) & (c < grid_w) & (cand < n)
+                cand = np.where(valid, cand, 0)
+                dist = (self.positions[cand, 0] - px) ** 2 + (self.positions[cand, 1] - py) ** 2
+                closer = valid & (dist < best_dist)
+                best = np.where(closer, cand + 1, best)
+                best_dist = np.where(closer, dist, best_dist)
+        return best
+
+    def write_map_assets(self, maps_dir: str, size: tuple[int, int], masks: bool = True):
+        """
+        Write map_id.png, map_base.png and (optionally) masks/<region>_mask.png to maps_dir.
+
+        Pass the directory *above* maps_dir as MapRenderer's assets_dir, and
+        id_colours() as its id_colours. Masks are full-size images, one per region,
+        so keep masks=False (and use render_mode="palette") for large worlds.
+        """
+        import pygame
+
+        ids = self.id_map(size)
+        os.makedirs(maps_dir, exist_ok=True)
+
+        rgb = np.stack(((ids >> 16) & 0xFF, (ids >> 8) & 0xFF, ids & 0xFF), axis=-1).astype(np.uint8)
+        pygame.image.save(pygame.surfarray.make_surface(rgb), os.path.join(maps_dir, "map_id.png"))
+
+        # Base map: flat land colour with darker borders between regions.
+        border = np.zeros(size, dtype=bool)
+        border[1:, :] |= ids[1:, :] != ids[:-1, :]
+        border[:, 1:] |= ids[:, 1:] != ids[:, :-1]
+        base = np.empty(size + (3,), dtype=np.uint8)
+        base[...] = (68, 111, 0)
+        base[border] = (34, 55, 0)
+        pygame.image.save(pygame.surfarray.make_surface(base), os.path.join(maps_dir, "map_base.png"))
+
+        if not masks:
+            return
+
+        masks_dir = os.path.join(maps_dir, "masks")
+        os.makedirs(masks_dir, exist_ok=True)
+        for k, name in enumerate(self.region_names):
+            mask = pygame.Surface(size, pygame.SRCALPHA)
+            mask.fill((255, 255, 255, 0))
+            alpha = pygame.surfarray.pixels_alpha(mask)
+            alpha[ids == k + 1] = 255
+            del alpha  # release the pixel lock before saving
+            pygame.image.save(mask, os.path.join(masks_dir, f"{name}_mask.png"))
+
+
+def _grid_shape(n: int) -> tuple[int, int]:
+    grid_w = max(1, math.ceil(math.sqrt(n)))
+    return grid_w, max(1, math.ceil(n / grid_w))
+
+
+def generate_world(
+    n: int,
+    seed: int = 0,
+    world_population: int = DEFAULT_WORLD_POPULATION,
+    population_sigma: float = 1.2,
+    water_fraction: float = 0.1,
+    routes_per_region: int = 3,
+    passenger_scale: float = 2e-5,
+    jitter: float = 0.35,
+) -> GeneratedWorld:
+    """
+    Build an n-region world from `seed` (same arguments -> identical world).
+
+    water_fraction is the share of candidate borders removed; jitter (< 0.5) is how
+    far a region centre may move from its grid cell centre, in cell widths.
+    """
+    if n <= 0:
+        raise ValueError(f"n must be positive, got {n}")
+    if not 0.0 <= water_fraction < 1.0:
+        raise ValueError(f"water_fraction must be in [0, 1), got {water_fraction}")
+    if not 0.0 <= jitter < 0.5:
+        raise ValueError(f"jitter must be in [0, 0.5), got {jitter}")
+
+    rng = np.random.default_rng(seed)
+    digits = len(str(n - 1))
+    region_names = [f"region_{k:0{digits}d}" for k in range(n)]
+
+    # Populations: lognormal shares of the world total.
+    shares = rng.lognormal(mean=0.0, sigma=population_sigma, size=n)
+    population = np.maximum(
+        np.round(shares / shares.sum() * world_population).astype(np.int64), MIN_REGION_POPULATION
+    )
+    healthcare = np.round(rng.beta(2.0, 2.0, size=n), 2)
+    airports_open = np.ones(n, dtype=bool)
+
+    # Region centres on a jittered grid.
+    grid_w, grid_h = _grid_shape(n)
+    k = np.arange(n, dtype=np.int64)
+    row, col = np.divmod(k, grid_w)
+    positions = np.empty((n, 2), dtype=np.float64)
+    positions[:, 0] = (col + 0.5 + rng.uniform(-jitter, jitter, size=n)) / grid_w
+    positions[:, 1] = (row + 0.5 + rng.uniform(-jitter, jitter, size=n)) / grid_h
+
+    # Candidate borders: right and down neighbours, plus one diagonal per grid cell.
+    has_right = (col + 1 < grid_w) & (k + 1 < n)
+    has_down = k + grid_w < n
+    main_diagonal = rng.random(n) < 0.5
+    has_cell = has_right & (k + grid_w + 1 < n)
+
+    src = np.concatenate((
+        k[has_right],
+        k[has_down],
+        k[has_cell & main_diagonal],
+        k[has_cell & ~main_diagonal] + 1,
+    ))
+    dst = np.concatenate((
+        k[has_right] + 1,
+        k[has_down] + grid_w,
+        k[has_cell & main_diagonal] + grid_w + 1,
+        k[has_cell & ~main_diagonal] + grid_w,
+    ))
+    keep = rng.random(src.size) >= water_fraction
+    src, dst = src[keep], dst[keep]
+
+    # Both directions, grouped by source (neighbours in ascending order) -> CSR.
+    both_src = np.concatenate((src, dst))
+    both_dst = np.concatenate((dst, src))
+    order = np.lexsort((both_dst, both_src))
+    indices = both_dst[order]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(both_src, minlength=n), out=offsets[1:])
+
+    # Air routes: population-weighted destinations, passengers ~ sqrt(pop_a * pop_b).
+    route_origins = np.repeat(k, routes_per_region)
+    route_destinations = rng.choice(n, size=route_origins.size, p=population / population.sum())
+    distinct = route_origins != route_destinations
+    route_origins = route_origins[distinct]
+    route_destinations = route_destinations[distinct]
+    route_passengers = np.round(
+        passenger_scale * np.sqrt(population[route_origins] * population[route_destinations].astype(np.float64)), 1
+    )
+
+    return GeneratedWorld(
+        region_names,
+        population,
+        healthcare,
+        airports_open,
+        positions,
+        offsets,
+        indices,
+        route_origins,
+        route_destinations,
+        route_passengers,
+        seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic world and print a summary.")
+    parser.add_argument("regions", type=int, help="Number of regions")
+    parser.add_argument("--seed", type=int, default=0, help="World seed")
+    parser.add_argument("--maps-dir", help="Also write map_id.png / map_base.png here")
+    parser.add_argument("--size", default="1280x720", help="Map image size for --maps-dir (WxH)")
+    parser.add_argument("--masks", action="store_true", help="Also write one mask per region (small worlds only)")
+    args = parser.parse_args(argv)
+
+    world = generate_world(args.regions, seed=args.seed)
+    degree = np.diff(world.offsets)
+    print(f"Regions: {len(world):,}  (seed {world.seed})")
+    print(f"Population: {int(world.population.sum()):,}  (largest {int(world.population.max()):,})")
+    print(f"Land borders: {len(world.indices) // 2:,}  (mean degree {degree.mean():.2f}, isolated {int((degree == 0).sum()):,})")
+    print(f"Air routes: {len(world.route_passengers):,}")
+
+    if args.maps_dir:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+        world.write_map_assets(args.maps_dir, (width, height), masks=args.masks)
+        print(f"[+] Map assets written to {args.maps_dir}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,552 @@
+"""
+world_loader.py
+
+Load world definitions from data files, validate them in one pass, and cache the
+compiled result.
+
+A world is the same data region_data.py holds as dict literals: region config,
+land borders, ID-map colours, plus air routes. Two file formats are accepted:
+
+JSON (one file):
+
+    {
+        "regions":     {"china": {"population": 1400000000, "healthcare_score": 0.7,
+                                  "airports_open": true}, ...},
+        "connections": {"china": ["india", "russia", ...], ...},
+        "id_colours":  {"china": "00ff00ff", ...},                 (optional)
+        "air_routes":  [["china", "usa", 3000], ...]              (optional)
+    }
+
+CSV (a directory):
+
+    regions.csv     name,population,healthcare_score,airports_open[,id_colour]
+    borders.csv     region,neighbour              (one row per direction, like LAND_CONNECTIONS)
+    air_routes.csv  origin,destination,daily_passengers      (optional, same as air_travel.py)
+
+validate_world() checks everything at once and raises a single ValueError that
+lists every problem: region fields, unknown or duplicate names, self-borders,
+borders listed in one direction only, ID colours that are malformed, shared or
+missing, air routes to unknown regions, and (when masks_dir is given) regions
+without a <region>_mask.png.
+
+load_world() returns a CompiledWorld: index order, numpy arrays and the CSR
+land graph. With cache_dir set the compiled arrays are stored as .npz named
+after a hash of the source files' contents, so the next launch with unchanged
+files skips parsing and validation entirely. Masks are checked on every load
+(they live outside the hashed files).
+
+Usage:
+    world = load_world("worlds/earth.json", cache_dir="assets/.cache", masks_dir="assets/maps/masks")
+    simulation = world.simulation(engine="vector")
+    renderer = MapRenderer("assets", (1280, 720), world.region_names, id_colours=world.id_colours())
+
+    python world_loader.py export worlds/earth.json       # write region_data.py out as a JSON world
+    python world_loader.py check worlds/earth.json --masks assets/maps/masks
+    python world_loader.py check                           # validate region_data.py itself
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+from operator import itemgetter
+from typing import NamedTuple
+
+import numpy as np
+
+from air_travel import AIR_ROUTES_PATH, load_air_routes
+from world_gen import (
+    world_air_network,
+    world_air_routes,
+    world_build_regions,
+    world_connections,
+    world_land_graph,
+    world_len,
+    world_region_config,
+    world_simulation,
+)
+
+# Bump when the compiled layout changes so stale cache files are ignored.
+WORLD_CACHE_VERSION = 1
+
+CSV_FILES = ("regions.csv", "borders.csv", "air_routes.csv")
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Populations are compiled to int64.
+MAX_REGION_POPULATION = int(np.iinfo(np.int64).max)
+
+
+class CompiledWorld(NamedTuple):
+    """A validated world as arrays; row k of every array is region_names[k]."""
+
+    region_names: list[str]
+    population: np.ndarray        # int64
+    healthcare: np.ndarray        # float64
+    airports_open: np.ndarray     # bool
+    id_rgba: np.ndarray           # uint32 0xRRGGBBAA per region, 0 = no ID colour
+    offsets: np.ndarray           # land borders, CSR (see adjacency.py)
+    indices: np.ndarray
+    route_origins: np.ndarray     # air routes as parallel index arrays
+    route_destinations: np.ndarray
+    route_passengers: np.ndarray
+    content_hash: str
+
+    __len__ = world_len
+    land_graph = world_land_graph
+    air_network = world_air_network
+    region_config = world_region_config
+    connections = world_connections
+    air_routes = world_air_routes
+    build_regions = world_build_regions
+    simulation = world_simulation
+
+    def index(self) -> dict[str, int]:
+        return {name: idx for idx, name in enumerate(self.region_names)}
+
+    def id_colours(self) -> dict[str, str]:
+        """Same shape as region_data.REGION_ID_HEX (regions without a colour are left out)."""
+        return {name: f"{rgba:08x}" for name, rgba in zip(self.region_names, self.id_rgba.tolist()) if rgba}
+
+
+# -----------------------------------------------------------------------------
+# Reading source files
+# -----------------------------------------------------------------------------
+
+def _source_files(path: str) -> list[str]:
+    """The files a world is read from (their bytes make up the cache key)."""
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in CSV_FILES]
+        for required in files[:2]:
+            if not os.path.exists(required):
+                raise FileNotFoundError(f"Missing world file: {required}")
+        return [f for f in files if os.path.exists(f)]
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing world file: {path}")
+    return [path]
+
+
+def content_hash(path: str) -> str:
+    """SHA-1 over the world's source files (names and bytes) and the cache version."""
+    digest = hashlib.sha1(f"world-v{WORLD_CACHE_VERSION}".encode("utf-8"))
+    for file_path in _source_files(path):
+        digest.update(os.path.basename(file_path).encode("utf-8") + b"\0")
+        with open(file_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return True
+    if text in ("0", "false", "no", "n", ""):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def read_world_source(path: str) -> dict:
+    """
+    Read a JSON file or CSV directory into plain dicts (no validation):
+
+        {"regions": [(name, cfg), ...], "connections": {...}, "id_colours": {...}, "air_routes": [...]}
+
+    Regions stay a list of pairs so duplicate names can still be reported.
+    """
+    if os.path.isdir(path):
+        return _read_csv_world(path)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing world file: {path}")
+    with open(path, "r") as f:
+        # object_pairs_hook keeps duplicate keys in "regions" visible to validation.
+        data = json.load(f, object_pairs_hook=lambda pairs: pairs)
+    data = dict(data)
+
+    return {
+        "regions": [(name, dict(cfg)) for name, cfg in data.get("regions", [])],
+        "connections": {name: list(nbrs) for name, nbrs in data.get("connections", [])},
+        "id_colours": dict(data.get("id_colours", [])),
+        "air_routes": [tuple(route) for route in data.get("air_routes", [])],
+    }
+
+
+def _csv_rows(path: str, required: tuple[str, ...], optional: tuple[str, ...] = ()):
+    """
+    Rows of a CSV file as tuples in (required + optional) column order ("" for a
+    missing optional column). Plain csv.reader: DictReader is several times slower
+    on files with hundreds of thousands of rows.
+    """
+    with open(path, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        missing = [column for column in required if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+
+        positions = [header.index(column) if column in header else None for column in required + optional]
+        if None not in positions:
+            # Fast path: every column present, so rows are picked apart in C.
+            pick = itemgetter(*positions)
+            try:
+                yield from map(pick, filter(None, reader))
+            except IndexError:
+                raise ValueError(f"{path}: line {reader.line_num} has too few columns") from None
+            return
+
+        for row in reader:
+            if row:
+                yield tuple(row[pos] if pos is not None and pos < len(row) else "" for pos in positions)
+
+
+def _read_csv_world(path: str) -> dict:
+    _source_files(path)  # raises FileNotFoundError if a required file is missing
+
+    regions = []
+    id_colours = {}
+    rows = _csv_rows(
+        os.path.join(path, "regions.csv"),
+        ("name", "population", "healthcare_score"),
+        ("airports_open", "id_colour"),
+    )
+    for name, population, healthcare_score, airports_open, id_colour in rows:
+        regions.append((name, {
+            "population": population,
+            "healthcare_score": healthcare_score,
+            "airports_open": airports_open or "true",
+        }))
+        if id_colour:
+            id_colours[name] = id_colour
+
+    connections: dict[str, list[str]] = {}
+    for region, neighbour in _csv_rows(os.path.join(path, "borders.csv"), ("region", "neighbour")):
+        connections.setdefault(region, []).append(neighbour)
+
+    air_routes = []
+    air_routes_path = os.path.join(path, "air_routes.csv")
+    if os.path.exists(air_routes_path):
+        rows = _csv_rows(air_routes_path, ("origin", "destination", "daily_passengers"))
+        air_routes = [(origin, destination, float(passengers)) for origin, destination, passengers in rows]
+    return {"regions": regions, "connections": connections, "id_colours": id_colours, "air_routes": air_routes}
+
+
+# -----------------------------------------------------------------------------
+# Validation + compilation
+# -----------------------------------------------------------------------------
+
+def validate_world(source: dict, masks_dir: str | None = None) -> list[str]:
+    """Every problem in a world source (see read_world_source), as readable messages."""
+    errors = []
+    names = [name for name, _cfg in source["regions"]]
+    known = set(names)
+
+    if not names:
+        errors.append("World has no regions")
+
+    seen = set()
+    for name, cfg in source["regions"]:
+        if name in seen:
+            errors.append(f"Duplicate region '{name}'")
+        seen.add(name)
+        if not name or any(ch in name for ch in "/\\\n"):
+            errors.append(f"Invalid region name {name!r}")
+
+        try:
+            population = float(cfg["population"])
+            # isfinite first: int() of inf raises OverflowError.
+            if (
+                not math.isfinite(population)
+                or population <= 0
+                or population != int(population)
+                or population > MAX_REGION_POPULATION
+            ):
+                errors.append(f"Region '{name}': population must be a positive whole number, got {cfg['population']!r}")
+        except (KeyError, TypeError, ValueError, OverflowError):
+            errors.append(f"Region '{name}': missing or invalid population")
+
+        try:
+            score = float(cfg["healthcare_score"])
+            if not 0.0 <= score <= 1.0:
+                errors.append(f"Region '{name}': healthcare_score must be in 0..1, got {score}")
+        except (KeyError, TypeError, ValueError):
+            errors.append(f"Region '{name}': missing or invalid healthcare_score")
+
+        try:
+            _parse_bool(cfg.get("airports_open", True))
+        except ValueError as e:
+            errors.append(f"Region '{name}': airports_open is {e}")
+
+    # Land borders: known names, no self/duplicate borders, and symmetric. Borders
+    # are mapped to index pairs once so the checks are array operations (large
+    # worlds have millions of directed borders).
+    connections = source["connections"]
+    index = {name: idx for idx, name in enumerate(names)}
+    for src in connections:
+        if src not in index:
+            errors.append(f"Borders listed for unknown region '{src}'")
+
+    listed = [(src, nbrs) for src, nbrs in connections.items() if src in index]
+    src_idx = np.repeat(
+        np.array([index[src] for src, _nbrs in listed], dtype=np.int64),
+        [len(nbrs) for _src, nbrs in listed],
+    )
+    dst_idx = np.array([index.get(dst, -1) for _src, nbrs in listed for dst in nbrs], dtype=np.int64)
+
+    for k in np.flatnonzero(dst_idx < 0).tolist():
+        dst = [dst for _src, nbrs in listed for dst in nbrs][k]
+        errors.append(f"Region '{names[src_idx[k]]}' borders unknown region '{dst}'")
+    for k in np.flatnonzero(src_idx == dst_idx).tolist():
+        errors.append(f"Region '{names[src_idx[k]]}' borders itself")
+
+    valid = (dst_idx >= 0) & (src_idx != dst_idx)
+    n = len(names)
+    forward = src_idx[valid] * n + dst_idx[valid]
+    unique, counts = np.unique(forward, return_counts=True)
+    for key in unique[counts > 1].tolist():
+        errors.append(f"Border {names[key // n]} -> {names[key % n]} is listed twice")
+    one_way = unique[~np.isin(unique, (unique % n) * n + unique // n)]
+    for key in one_way.tolist():
+        src, dst = names[key // n], names[key % n]
+        errors.append(f"Border {src} -> {dst} has no reverse border {dst} -> {src}")
+
+    # ID colours: optional as a whole, but if present every region needs a distinct one.
+    id_colours = source["id_colours"]
+    if id_colours:
+        for name in names:
+            if name not in id_colours:
+                errors.append(f"Region '{name}' has no ID colour")
+        owners: dict[str, str] = {}
+        for name, colour in id_colours.items():
+            if name not in known:
+                errors.append(f"ID colour given for unknown region '{name}'")
+            text = str(colour).lower()
+            if len(text) != 8 or not _HEX_DIGITS.issuperset(text):
+                errors.append(f"Region '{name}': ID colour must be 'rrggbbaa' hex, got {colour!r}")
+                continue
+            # Alpha is ignored when the ID map is decoded, so RGB alone must be unique.
+            rgb = text[:6]
+            if rgb == "000000":
+                errors.append(f"Region '{name}': ID colour 000000 is reserved for 'no region'")
+            elif rgb in owners:
+                errors.append(f"Regions '{owners[rgb]}' and '{name}' share ID colour {rgb}")
+            else:
+                owners[rgb] = name
+
+    for route in source["air_routes"]:
+        if len(route) != 3:
+            errors.append(f"Air route {route!r} must be (origin, destination, daily_passengers)")
+            continue
+        origin, destination, passengers = route
+        for end in (origin, destination):
+            if end not in known:
+                errors.append(f"Air route {origin} -> {destination} references unknown region '{end}'")
+        try:
+            if not math.isfinite(float(passengers)):
+                errors.append(f"Air route {origin} -> {destination}: invalid passengers {passengers!r}")
+            elif float(passengers) < 0:
+                errors.append(f"Air route {origin} -> {destination}: negative passengers")
+        except (TypeError, ValueError):
+            errors.append(f"Air route {origin} -> {destination}: invalid passengers {passengers!r}")
+
+    if masks_dir is not None:
+        errors.extend(check_masks(names, masks_dir))
+
+    return errors
+
+
+def check_masks(region_names: list[str], masks_dir: str) -> list[str]:
+    """One message per region without a <region>_mask.png in masks_dir."""
+    return [
+        f"Missing mask for region '{name}': {os.path.join(masks_dir, f'{name}_mask.png')}"
+        for name in region_names
+        if not os.path.exists(os.path.join(masks_dir, f"{name}_mask.png"))
+    ]
+
+
+def compile_world(source: dict, content_hash: str = "") -> CompiledWorld:
+    """Arrays + CSR from a source that passed validate_world()."""
+    names = [name for name, _cfg in source["regions"]]
+    configs = [cfg for _name, cfg in source["regions"]]
+    index = {name: idx for idx, name in enumerate(names)}
+
+    population = np.array([int(float(cfg["population"])) for cfg in configs], dtype=np.int64)
+    healthcare = np.array([float(cfg["healthcare_score"]) for cfg in configs], dtype=np.float64)
+    airports_open = np.array([_parse_bool(cfg.get("airports_open", True)) for cfg in configs], dtype=bool)
+
+    id_colours = source["id_colours"]
+    id_rgba = np.array([int(id_colours.get(name, "0"), 16) for name in names], dtype=np.uint32)
+
+    # Same CSR layout (and neighbour order) as LandGraph.from_connections.
+    connections = source["connections"]
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    neighbour_lists = [connections.get(name, []) for name in names]
+    np.cumsum([len(nbrs) for nbrs in neighbour_lists], out=offsets[1:])
+    indices = np.array([index[dst] for nbrs in neighbour_lists for dst in nbrs], dtype=np.int64)
+
+    routes = source["air_routes"]
+    route_origins = np.array([index[o] for o, _d, _p in routes], dtype=np.int64)
+    route_destinations = np.array([index[d] for _o, d, _p in routes], dtype=np.int64)
+    route_passengers = np.array([float(p) for _o, _d, p in routes], dtype=np.float64)
+
+    return CompiledWorld(
+        names,
+        population,
+        healthcare,
+        airports_open,
+        id_rgba,
+        offsets,
+        indices,
+        route_origins,
+        route_destinations,
+        route_passengers,
+        content_hash,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Binary cache
+# -----------------------------------------------------------------------------
+
+_ARRAY_FIELDS = (
+    "population",
+    "healthcare",
+    "airports_open",
+    "id_rgba",
+    "offsets",
+    "indices",
+    "route_origins",
+    "route_destinations",
+    "route_passengers",
+)
+
+
+def _cache_path(cache_dir: str, digest: str) -> str:
+    return os.path.join(cache_dir, f"world-{digest}.npz")
+
+
+def _write_cache(path: str, world: CompiledWorld):
+    # Write-then-rename so an interrupted write never leaves a truncated cache file.
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(
+        tmp_path,
+        version=np.array(WORLD_CACHE_VERSION),
+        region_names=np.array(world.region_names, dtype=np.str_),
+        **{field: getattr(world, field) for field in _ARRAY_FIELDS},
+    )
+    os.replace(tmp_path, path)
+
+
+def _read_cache(path: str, digest: str) -> CompiledWorld | None:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != WORLD_CACHE_VERSION:
+                return None
+            arrays = {field: data[field] for field in _ARRAY_FIELDS}
+            region_names = data["region_names"].tolist()
+    except (OSError, KeyError, ValueError):
+        # Missing, stale or damaged cache: fall back to parsing (it gets rewritten).
+        return None
+    return CompiledWorld(region_names=region_names, content_hash=digest, **arrays)
+
+
+def load_world(path: str, cache_dir: str | None = None, masks_dir: str | None = None) -> CompiledWorld:
+    """
+    Load, validate and compile a world file (JSON) or directory (CSV).
+
+    Raises ValueError listing every validation problem. With cache_dir, a compiled
+    copy keyed by content_hash(path) is reused while the source files are unchanged.
+    """
+    digest = content_hash(path)
+
+    world = None
+    cache_path = _cache_path(cache_dir, digest) if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        world = _read_cache(cache_path, digest)
+
+    if world is None:
+        source = read_world_source(path)
+        errors = validate_world(source)
+        if errors:
+            raise ValueError(f"Invalid world {path}:\n  " + "\n  ".join(errors))
+        world = compile_world(source, digest)
+
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            _write_cache(cache_path, world)
+
+    if masks_dir is not None:
+        errors = check_masks(world.region_names, masks_dir)
+        if errors:
+            raise ValueError(f"Invalid world {path}:\n  " + "\n  ".join(errors))
+
+    return world
+
+
+# -----------------------------------------------------------------------------
+# region_data.py <-> world files
+# -----------------------------------------------------------------------------
+
+def region_data_source() -> dict:
+    """The built-in world (region_data.py + air_routes.csv) in read_world_source() shape."""
+    from region_data import LAND_CONNECTIONS, REGION_CONFIG, REGION_ID_HEX
+
+    return {
+        "regions": [(name, dict(cfg)) for name, cfg in REGION_CONFIG.items()],
+        "connections": {name: list(nbrs) for name, nbrs in LAND_CONNECTIONS.items()},
+        "id_colours": dict(REGION_ID_HEX),
+        "air_routes": load_air_routes(AIR_ROUTES_PATH) if os.path.exists(AIR_ROUTES_PATH) else [],
+    }
+
+
+def write_world_json(path: str, source: dict):
+    """Write a world source (read_world_source() shape) as a JSON world file."""
+    data = {
+        "regions": {name: cfg for name, cfg in source["regions"]},
+        "connections": source["connections"],
+        "id_colours": source["id_colours"],
+        "air_routes": [list(route) for route in source["air_routes"]],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate, compile and export world data files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    check = sub.add_parser("check", help="Validate a world (region_data.py if no path is given)")
+    check.add_argument("path", nargs="?", help="World JSON file or CSV directory")
+    check.add_argument("--masks", help="Also require <region>_mask.png for every region in this directory")
+
+    export = sub.add_parser("export", help="Write region_data.py (+ air_routes.csv) as a JSON world")
+    export.add_argument("out", help="Output JSON path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        source = region_data_source()
+        write_world_json(args.out, source)
+        print(f"[+] Wrote {len(source['regions'])} regions to {args.out}")
+        return 0
+
+    source = read_world_source(args.path) if args.path else region_data_source()
+    errors = validate_world(source, masks_dir=args.masks)
+    label = args.path or "region_data.py"
+    if errors:
+        print(f"[!] {label}: {len(errors)} problem(s)")
+        for error in errors:
+            print(f"  {error}")
+        return 1
+
+    print(f"[+] {label}: {len(source['regions'])} regions OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())